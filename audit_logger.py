@@ -9,12 +9,257 @@ audit trail for security and debugging.
 Phase 2: Bidirectional Communication
 """
 
+import array
+import atexit
 import logging
 import json
+import operator
 import os
+import queue
+import stat
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional, List
-from logging.handlers import RotatingFileHandler
+from typing import Dict, Any, Optional, List, Tuple, Callable, Union
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    """
+    Serialize with the stdlib encoder
+
+    Values JSON can't represent are written as strings, so an unusual
+    command value can never make audit logging fail.
+    """
+    return json.dumps(obj, default=str)
+
+
+# Fast JSON serialization (optional - falls back to stdlib json)
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        """Serialize to compact JSON using orjson"""
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC).decode()
+        except TypeError:
+            # e.g. integers wider than 64 bits, which orjson rejects
+            return _stdlib_dumps(obj)
+
+    def _dumpb(obj: Any) -> bytes:
+        """Serialize to compact JSON bytes using orjson"""
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC)
+        except TypeError:
+            return _stdlib_dumps(obj).encode()
+except ImportError:
+    orjson = None
+    _dumps = _stdlib_dumps
+
+    def _dumpb(obj: Any) -> bytes:
+        """Serialize to JSON bytes using the stdlib encoder"""
+        return _stdlib_dumps(obj).encode()
+
+# Bound references for the per-entry timestamp path
+_time_ns = time.time_ns
+_fromtimestamp = datetime.fromtimestamp
+
+
+def _derive_stats(total: int, success: int, total_latency_ms: float) -> Tuple[float, float]:
+    """
+    Compute derived audit statistics from raw counters
+
+    Returns:
+        (avg_latency_ms, success_rate) rounded to 2 decimals, 0 when undefined
+    """
+    avg_latency_ms = round(total_latency_ms / success, 2) if success else 0
+    success_rate = round((success / total) * 100, 2) if total else 0
+    return avg_latency_ms, success_rate
+
+
+# =============================================================================
+# Command Field Extraction
+# =============================================================================
+
+_COMMAND_KEYS = ('entity_id', 'command_type', 'action', 'value')
+_command_fields_getter = operator.itemgetter(*_COMMAND_KEYS)
+
+
+def _command_fields(command: Dict[str, Any]) -> Tuple[Any, Any, Any, Any]:
+    """
+    Extract (entity_id, command_type, action, value) from a command
+
+    Parsed MQTT commands always carry all four keys, so a single C-level
+    itemgetter call covers the common case; partial dicts fall back to
+    per-key lookups with None for missing keys.
+    """
+    try:
+        return _command_fields_getter(command)
+    except KeyError:
+        return tuple(command.get(key) for key in _COMMAND_KEYS)
+
+
+# =============================================================================
+# Human-Readable Formatters (one per event type)
+# =============================================================================
+
+_attempt_fields = operator.itemgetter('cmd_id', 'entity_id', 'command_type', 'value')
+_validation_fields = operator.itemgetter('cmd_id', 'entity_id', 'error_code', 'error_message')
+_success_fields = operator.itemgetter('cmd_id', 'entity_id', 'command_type', 'can_frames', 'latency_ms')
+_tx_failure_fields = operator.itemgetter('cmd_id', 'entity_id', 'error_message')
+
+
+def _fmt_command_attempt(entry: Dict[str, Any]) -> str:
+    cmd_id, entity_id, cmd_type, value = _attempt_fields(entry)
+    return f"[{cmd_id}] Attempt: {entity_id} ({cmd_type}) = {value}"
+
+
+def _fmt_validation_failure(entry: Dict[str, Any]) -> str:
+    cmd_id, entity_id, error_code, error_message = _validation_fields(entry)
+    return f"[{cmd_id}] Validation Failed: {entity_id} - {error_code}: {error_message}"
+
+
+def _fmt_command_success(entry: Dict[str, Any]) -> str:
+    cmd_id, entity_id, cmd_type, can_frames, latency = _success_fields(entry)
+    return f"[{cmd_id}] Success: {entity_id} ({cmd_type}) - {len(can_frames)} frames in {latency}ms"
+
+
+def _fmt_transmission_failure(entry: Dict[str, Any]) -> str:
+    cmd_id, entity_id, error_message = _tx_failure_fields(entry)
+    return f"[{cmd_id}] TX Failed: {entity_id} - {error_message}"
+
+
+def _fmt_default(entry: Dict[str, Any]) -> str:
+    return f"{entry.get('event', 'unknown')}: {entry.get('message', _dumps(entry))}"
+
+
+_HUMAN_FORMATTERS = {
+    'command_attempt': _fmt_command_attempt,
+    'validation_failure': _fmt_validation_failure,
+    'command_success': _fmt_command_success,
+    'transmission_failure': _fmt_transmission_failure,
+}
+
+
+class _JsonAppendWriter:
+    """
+    Append-only writer for JSON-lines audit logs
+
+    The log file is opened once with O_APPEND, so each entry is a single
+    atomic write() syscall with no logging Handler/Formatter pipeline.
+    Rotation follows RotatingFileHandler naming (log, log.1 ... log.N) and
+    is driven by a tracked byte count rather than a per-write stat.
+
+    With batch_size > 1, entries are buffered and appended together once
+    batch_size entries are pending or flush() is called.
+
+    Like logging.Handler, I/O errors never reach the caller: the affected
+    entries are dropped and counted in `errors`.
+    """
+
+    __slots__ = ('path', 'max_bytes', 'backup_count', 'batch_size', 'errors',
+                 '_fd', '_size', '_can_rotate', '_pending', '_lock', '_closed')
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int,
+                 batch_size: int = 1):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = max(1, batch_size)
+        self.errors = 0
+        self._fd = None
+        self._pending = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._open()
+
+    def _open(self):
+        """Open (or reopen) the log file and sync the tracked size"""
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        st = os.fstat(fd)
+        self._fd = fd
+        self._size = st.st_size
+        # Only rotate regular files (e.g. never /dev/null)
+        self._can_rotate = (self.max_bytes > 0 and self.backup_count > 0
+                            and stat.S_ISREG(st.st_mode))
+
+    def write(self, data: bytes):
+        """Append one encoded entry (buffered when batching is enabled)"""
+        with self._lock:
+            if self._closed:
+                return
+            if self.batch_size == 1:
+                self._safe_append(data)
+                return
+            pending = self._pending
+            pending.append(data)
+            if len(pending) >= self.batch_size:
+                self._flush_pending()
+
+    def flush(self):
+        """Append any buffered entries to the file"""
+        with self._lock:
+            if self._pending and not self._closed:
+                self._flush_pending()
+
+    def _flush_pending(self):
+        """Append and clear the buffered entries (lock held)"""
+        pending = self._pending
+        if not self._safe_append(b''.join(pending)):
+            self.errors += len(pending) - 1
+        pending.clear()
+
+    def _safe_append(self, data: bytes) -> bool:
+        """Append data, counting it as dropped on I/O errors (lock held)"""
+        try:
+            self._append(data)
+            return True
+        except OSError:
+            self.errors += 1
+            return False
+
+    def _append(self, data: bytes):
+        """Write data in one syscall, rotating first if it would overflow"""
+        if self._fd is None:
+            # A previous reopen failed; try again
+            self._open()
+        if (self._can_rotate and self._size > 0
+                and self._size + len(data) > self.max_bytes):
+            self._rollover()
+        written = os.write(self._fd, data)
+        if written < len(data):
+            view = memoryview(data)
+            while written < len(data):
+                written += os.write(self._fd, view[written:])
+        self._size += len(data)
+
+    def _rollover(self):
+        """Shift log.N-1 -> log.N ... log -> log.1 and start a new file"""
+        fd, self._fd = self._fd, None
+        os.close(fd)
+        try:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        finally:
+            self._open()
+
+    def close(self):
+        """Flush buffered entries and close the log file"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._pending:
+                self._flush_pending()
+            if self._fd is not None:
+                try:
+                    os.close(self._fd)
+                except OSError:
+                    pass
+                self._fd = None
 
 
 class AuditLogger:
@@ -34,6 +279,12 @@ class AuditLogger:
     - Source information
     """
 
+    __slots__ = (
+        'log_file', 'log_level', 'max_bytes', 'backup_count', 'batch_size', 'json_format',
+        'console_output', 'logger', '_writer', '_queue', '_listener', '_counters',
+        '_total_latency_ms', '_stats_lock', '_ts_cache', '_info_writer',
+    )
+
     # Log levels
     LEVEL_DEBUG = logging.DEBUG      # Detailed debugging info
     LEVEL_INFO = logging.INFO        # Normal command logging
@@ -41,13 +292,41 @@ class AuditLogger:
     LEVEL_ERROR = logging.ERROR      # Transmission failures, errors
     LEVEL_CRITICAL = logging.CRITICAL # System failures
 
+    # Statistics counter indices
+    IDX_TOTAL = 0
+    IDX_SUCCESS = 1
+    IDX_FAILED = 2
+    IDX_VALIDATION = 3
+    IDX_TRANSMISSION = 4
+
+    # Statistics names, in counter index order
+    STAT_NAMES = (
+        'total_commands',
+        'successful_commands',
+        'failed_commands',
+        'validation_failures',
+        'transmission_failures',
+    )
+
+    # Pre-encoded JSON prefixes for each event type ('{"event":"...",')
+    _event_prefixes = {
+        event: '{"event":"%s",' % event
+        for event in ('command_attempt', 'validation_failure',
+                      'command_success', 'transmission_failure')
+    }
+
+    # Background writer of the most recently created instance. The named
+    # logger is shared, so only one listener runs at a time.
+    _active_listener = None
+
     def __init__(self,
                  log_file: str = 'logs/command_audit.log',
                  log_level: int = LEVEL_INFO,
                  max_bytes: int = 10 * 1024 * 1024,  # 10 MB
                  backup_count: int = 5,
                  json_format: bool = True,
-                 console_output: bool = False):
+                 console_output: bool = False,
+                 batch_size: int = 1):
         """
         Initialize audit logger
 
@@ -58,6 +337,11 @@ class AuditLogger:
             backup_count: Number of backup files to keep
             json_format: If True, log in JSON format; if False, human-readable
             console_output: If True, also output to console
+            batch_size: Number of JSON entries to buffer before appending them
+                to the file (1 = write each entry immediately). Buffered
+                entries are written by flush() or close(), so up to
+                batch_size - 1 entries can be lost if the process dies.
+                Transmission failures are always flushed immediately.
         """
         self.log_file = log_file
         self.log_level = log_level
@@ -65,6 +349,7 @@ class AuditLogger:
         self.backup_count = backup_count
         self.json_format = json_format
         self.console_output = console_output
+        self.batch_size = batch_size
 
         # Create logs directory if it doesn't exist
         log_dir = os.path.dirname(log_file)
@@ -76,44 +361,73 @@ class AuditLogger:
         self.logger.setLevel(log_level)
         self.logger.propagate = False  # Don't propagate to root logger
 
-        # Clear existing handlers
+        # Clear existing handlers (and stop the previous writer thread)
         self.logger.handlers = []
+        if AuditLogger._active_listener is not None:
+            AuditLogger._active_listener.stop()
+            AuditLogger._active_listener = None
+
+        self._writer = None
+        self._queue = None
+        self._listener = None
+
+        if json_format and not console_output:
+            # JSON-only output: append entries directly to the file,
+            # bypassing the logging handlers (logger is kept for level checks)
+            self._writer = _JsonAppendWriter(log_file, max_bytes, backup_count, batch_size)
+        else:
+            # File handler with rotation
+            file_handler = RotatingFileHandler(
+                log_file,
+                maxBytes=max_bytes,
+                backupCount=backup_count
+            )
+            file_handler.setLevel(log_level)
+
+            handlers = [file_handler]
+
+            # Console handler (optional)
+            if console_output:
+                console_handler = logging.StreamHandler()
+                console_handler.setLevel(log_level)
+                handlers.append(console_handler)
+
+            # Format
+            if json_format:
+                formatter = logging.Formatter('%(message)s')
+            else:
+                formatter = logging.Formatter(
+                    '%(asctime)s - %(levelname)s - %(message)s',
+                    datefmt='%Y-%m-%d %H:%M:%S'
+                )
+
+            file_handler.setFormatter(formatter)
+
+            # Handlers run on a background thread; callers only enqueue
+            # records so file I/O and rotation stay off the command path
+            self._queue = queue.SimpleQueue()
+            queue_handler = QueueHandler(self._queue)
+            queue_handler.setLevel(log_level)
+            self.logger.addHandler(queue_handler)
+
+            self._listener = QueueListener(
+                self._queue, *handlers, respect_handler_level=True
+            )
+            self._listener.start()
+            AuditLogger._active_listener = self._listener
 
-        # File handler with rotation
-        file_handler = RotatingFileHandler(
-            log_file,
-            maxBytes=max_bytes,
-            backupCount=backup_count
-        )
-        file_handler.setLevel(log_level)
+        atexit.register(self.close)
 
-        # Console handler (optional)
-        if console_output:
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(log_level)
-            self.logger.addHandler(console_handler)
+        # Sink for command_success, the most frequent event
+        self._info_writer = self._make_info_writer()
 
-        # Format
-        if json_format:
-            formatter = logging.Formatter('%(message)s')
-        else:
-            formatter = logging.Formatter(
-                '%(asctime)s - %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
+        # Statistics (fixed int64 counters indexed by IDX_* constants)
+        self._counters = array.array('q', [0] * len(self.STAT_NAMES))
+        self._total_latency_ms = 0.0
+        self._stats_lock = threading.Lock()
 
-        file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
-
-        # Statistics
-        self.stats = {
-            'total_commands': 0,
-            'successful_commands': 0,
-            'failed_commands': 0,
-            'validation_failures': 0,
-            'transmission_failures': 0,
-            'total_latency_ms': 0,
-        }
+        # (epoch_ms, iso_string) of the last formatted timestamp
+        self._ts_cache = (0, '')
 
     # =========================================================================
     # Main Logging Methods
@@ -132,21 +446,27 @@ class AuditLogger:
         Returns:
             Command ID for tracking
         """
-        self.stats['total_commands'] += 1
-        cmd_id = self.stats['total_commands']
+        counters = self._counters
+        with self._stats_lock:
+            counters[self.IDX_TOTAL] += 1
+            cmd_id = counters[self.IDX_TOTAL]
+
+        # Attempts are logged at DEBUG; skip building the entry when filtered
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return cmd_id
 
+        entity_id, command_type, action, value = _command_fields(command)
         log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'event': 'command_attempt',
+            'timestamp': self._now_iso(),
             'cmd_id': cmd_id,
             'source': source,
-            'entity_id': command.get('entity_id'),
-            'command_type': command.get('command_type'),
-            'action': command.get('action'),
-            'value': command.get('value'),
+            'entity_id': entity_id,
+            'command_type': command_type,
+            'action': action,
+            'value': value,
         }
 
-        self._log(logging.DEBUG, log_entry)
+        self._log(logging.DEBUG, 'command_attempt', log_entry)
         return cmd_id
 
     def log_validation_failure(self,
@@ -165,26 +485,31 @@ class AuditLogger:
             error_message: Error description
             field: Field that failed validation (if applicable)
         """
-        self.stats['validation_failures'] += 1
-        self.stats['failed_commands'] += 1
+        counters = self._counters
+        with self._stats_lock:
+            counters[self.IDX_VALIDATION] += 1
+            counters[self.IDX_FAILED] += 1
 
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
+
+        entity_id, command_type, _, _ = _command_fields(command)
         log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'event': 'validation_failure',
+            'timestamp': self._now_iso(),
             'cmd_id': cmd_id,
-            'entity_id': command.get('entity_id'),
-            'command_type': command.get('command_type'),
+            'entity_id': entity_id,
+            'command_type': command_type,
             'error_code': error_code,
             'error_message': error_message,
             'field': field,
         }
 
-        self._log(logging.WARNING, log_entry)
+        self._log(logging.WARNING, 'validation_failure', log_entry)
 
     def log_command_success(self,
                            cmd_id: int,
                            command: Dict[str, Any],
-                           can_frames: List[str],
+                           can_frames: Union[List[str], Callable[[], List[str]]],
                            latency_ms: float):
         """
         Log successful command execution
@@ -192,32 +517,41 @@ class AuditLogger:
         Args:
             cmd_id: Command ID from log_command_attempt
             command: Command dictionary
-            can_frames: List of CAN frames sent (formatted as hex strings)
+            can_frames: List of CAN frames sent (formatted as hex strings), or
+                a callable returning that list; it is only called if the
+                entry is actually logged
             latency_ms: Total execution time in milliseconds
         """
-        self.stats['successful_commands'] += 1
-        self.stats['total_latency_ms'] += latency_ms
+        with self._stats_lock:
+            self._counters[self.IDX_SUCCESS] += 1
+            self._total_latency_ms += latency_ms
+
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
 
+        if callable(can_frames):
+            can_frames = can_frames()
+
+        entity_id, command_type, action, value = _command_fields(command)
         log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'event': 'command_success',
+            'timestamp': self._now_iso(),
             'cmd_id': cmd_id,
-            'entity_id': command.get('entity_id'),
-            'command_type': command.get('command_type'),
-            'action': command.get('action'),
-            'value': command.get('value'),
+            'entity_id': entity_id,
+            'command_type': command_type,
+            'action': action,
+            'value': value,
             'can_frames': can_frames,
             'frame_count': len(can_frames),
             'latency_ms': round(latency_ms, 2),
         }
 
-        self._log(logging.INFO, log_entry)
+        self._info_writer(log_entry)
 
     def log_transmission_failure(self,
                                  cmd_id: int,
                                  command: Dict[str, Any],
                                  error_message: str,
-                                 can_frames_attempted: Optional[List[str]] = None):
+                                 can_frames_attempted: Union[List[str], Callable[[], List[str]], None] = None):
         """
         Log CAN transmission failure
 
@@ -225,22 +559,35 @@ class AuditLogger:
             cmd_id: Command ID from log_command_attempt
             command: Command dictionary
             error_message: Error description
-            can_frames_attempted: Frames that were attempted (if available)
+            can_frames_attempted: Frames that were attempted (if available), or
+                a callable returning them; it is only called if the entry is
+                actually logged
         """
-        self.stats['transmission_failures'] += 1
-        self.stats['failed_commands'] += 1
+        counters = self._counters
+        with self._stats_lock:
+            counters[self.IDX_TRANSMISSION] += 1
+            counters[self.IDX_FAILED] += 1
+
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
 
+        if callable(can_frames_attempted):
+            can_frames_attempted = can_frames_attempted()
+
+        entity_id, command_type, _, _ = _command_fields(command)
         log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'event': 'transmission_failure',
+            'timestamp': self._now_iso(),
             'cmd_id': cmd_id,
-            'entity_id': command.get('entity_id'),
-            'command_type': command.get('command_type'),
+            'entity_id': entity_id,
+            'command_type': command_type,
             'error_message': error_message,
             'can_frames_attempted': can_frames_attempted,
         }
 
-        self._log(logging.ERROR, log_entry)
+        self._log(logging.ERROR, 'transmission_failure', log_entry)
+
+        # Failures are written out immediately, even when batching
+        self.flush()
 
     def log_system_event(self,
                         event_type: str,
@@ -256,38 +603,96 @@ class AuditLogger:
             details: Additional event details
             level: Log level
         """
+        if not self.logger.isEnabledFor(level):
+            return
+
         log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'event': event_type,
+            'timestamp': self._now_iso(),
             'message': message,
         }
 
         if details:
             log_entry['details'] = details
 
-        self._log(level, log_entry)
+        self._log(level, event_type, log_entry)
 
     # =========================================================================
     # Internal Methods
     # =========================================================================
 
-    def _log(self, level: int, entry: Dict[str, Any]):
+    def _make_info_writer(self):
+        """
+        Build the sink used for command_success entries
+
+        With the direct JSON writer, entries are serialized straight to bytes
+        and appended without going through the logging module. Otherwise the
+        regular _log() path is used.
+
+        Returns:
+            Callable taking the log entry dictionary (without the event field)
+        """
+        if self._writer is None:
+            def log_success(entry: Dict[str, Any]):
+                self._log(logging.INFO, 'command_success', entry)
+            return log_success
+
+        write = self._writer.write
+        prefix = self._event_prefixes['command_success'].encode()
+
+        def write_success(entry: Dict[str, Any]):
+            write(prefix + _dumpb(entry)[1:] + b'\n')
+        return write_success
+
+    def _log(self, level: int, event: str, entry: Dict[str, Any]):
         """
         Internal logging method
 
         Args:
             level: Log level
-            entry: Log entry dictionary
+            event: Event type (command_attempt, command_success, etc.)
+            entry: Log entry dictionary (without the event field)
         """
+        # Skip serialization entirely for entries the logger would discard
+        if not self.logger.isEnabledFor(level):
+            return
+
         if self.json_format:
-            # JSON format - one entry per line
-            log_message = json.dumps(entry)
+            # JSON format - one entry per line. The constant event prefix is
+            # encoded once per event type; only the variable fields are
+            # serialized per call.
+            prefix = self._event_prefixes.get(event)
+            if prefix is None:
+                prefix = '{"event":' + _dumps(event) + ','
+                self._event_prefixes[event] = prefix
+            log_message = prefix + _dumps(entry)[1:]
+            if self._writer is not None:
+                self._writer.write((log_message + '\n').encode())
+                return
         else:
             # Human-readable format
-            log_message = self._format_human_readable(entry)
+            log_message = self._format_human_readable({'event': event, **entry})
 
         self.logger.log(level, log_message)
 
+    def _now_iso(self) -> str:
+        """
+        Get current local time as an ISO 8601 string (millisecond precision)
+
+        The formatted string is cached per millisecond so bursts of entries
+        share a single datetime conversion.
+
+        Returns:
+            ISO 8601 timestamp string
+        """
+        ms = _time_ns() // 1_000_000
+        cached_ms, cached_iso = self._ts_cache
+        if ms == cached_ms:
+            return cached_iso
+
+        iso = _fromtimestamp(ms / 1000).isoformat(timespec='milliseconds')
+        self._ts_cache = (ms, iso)
+        return iso
+
     def _format_human_readable(self, entry: Dict[str, Any]) -> str:
         """
         Format log entry as human-readable string
@@ -298,26 +703,7 @@ class AuditLogger:
         Returns:
             Formatted string
         """
-        event = entry.get('event', 'unknown')
-        entity_id = entry.get('entity_id', 'N/A')
-        cmd_type = entry.get('command_type', 'N/A')
-
-        if event == 'command_attempt':
-            return f"[{entry.get('cmd_id')}] Attempt: {entity_id} ({cmd_type}) = {entry.get('value')}"
-
-        elif event == 'validation_failure':
-            return f"[{entry.get('cmd_id')}] Validation Failed: {entity_id} - {entry.get('error_code')}: {entry.get('error_message')}"
-
-        elif event == 'command_success':
-            frames = len(entry.get('can_frames', []))
-            latency = entry.get('latency_ms', 0)
-            return f"[{entry.get('cmd_id')}] Success: {entity_id} ({cmd_type}) - {frames} frames in {latency}ms"
-
-        elif event == 'transmission_failure':
-            return f"[{entry.get('cmd_id')}] TX Failed: {entity_id} - {entry.get('error_message')}"
-
-        else:
-            return f"{event}: {entry.get('message', json.dumps(entry))}"
+        return _HUMAN_FORMATTERS.get(entry.get('event'), _fmt_default)(entry)
 
     # =========================================================================
     # Statistics and Reporting
@@ -330,37 +716,27 @@ class AuditLogger:
         Returns:
             Dictionary with statistics
         """
-        stats = self.stats.copy()
+        with self._stats_lock:
+            counters = self._counters.tolist()
+            total_latency_ms = self._total_latency_ms
 
-        # Calculate derived stats
-        if stats['successful_commands'] > 0:
-            stats['avg_latency_ms'] = round(
-                stats['total_latency_ms'] / stats['successful_commands'],
-                2
-            )
-        else:
-            stats['avg_latency_ms'] = 0
+        stats = dict(zip(self.STAT_NAMES, counters))
+        stats['total_latency_ms'] = total_latency_ms
+        stats['write_errors'] = self._writer.errors if self._writer is not None else 0
 
-        if stats['total_commands'] > 0:
-            stats['success_rate'] = round(
-                (stats['successful_commands'] / stats['total_commands']) * 100,
-                2
-            )
-        else:
-            stats['success_rate'] = 0
+        # Calculate derived stats
+        stats['avg_latency_ms'], stats['success_rate'] = _derive_stats(
+            counters[self.IDX_TOTAL], counters[self.IDX_SUCCESS], total_latency_ms
+        )
 
         return stats
 
     def reset_stats(self):
         """Reset statistics counters"""
-        self.stats = {
-            'total_commands': 0,
-            'successful_commands': 0,
-            'failed_commands': 0,
-            'validation_failures': 0,
-            'transmission_failures': 0,
-            'total_latency_ms': 0,
-        }
+        with self._stats_lock:
+            for i in range(len(self._counters)):
+                self._counters[i] = 0
+            self._total_latency_ms = 0.0
 
     def print_stats(self):
         """Print statistics to console"""
@@ -382,6 +758,20 @@ class AuditLogger:
     # Context Manager Support
     # =========================================================================
 
+    def flush(self):
+        """Write any buffered JSON entries to the log file"""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self):
+        """Flush pending entries and release the log file / writer thread"""
+        atexit.unregister(self.close)
+        if self._writer is not None:
+            self._writer.close()
+        if self._listener is not None and AuditLogger._active_listener is self._listener:
+            AuditLogger._active_listener = None
+            self._listener.stop()
+
     def __enter__(self):
         """Context manager entry"""
         self.log_system_event('audit_start', 'Audit logging started')
@@ -390,6 +780,7 @@ class AuditLogger:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
         self.log_system_event('audit_stop', 'Audit logging stopped')
+        self.close()
         self.print_stats()
 
 
@@ -532,6 +923,7 @@ def test_audit_logger():
         ['19FEDB63#01FFC800FF00FFFF'],
         latency_ms=25.5
     )
+    logger_json.close()
 
     # Read and verify JSON
     with open('logs/test_audit_json.log', 'r') as f:
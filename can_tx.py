@@ -9,12 +9,32 @@ and error handling.
 Phase 2: Bidirectional Communication
 """
 
+import array
 import can
+import queue
 import time
 import serial
+import struct
+import threading
+from concurrent.futures import Future
 from typing import List, Tuple, Optional
 from datetime import datetime
 
+# SocketCAN raw-socket fast path (Linux only)
+try:
+    from can.interfaces.socketcan import SocketcanBus
+except ImportError:
+    SocketcanBus = None
+
+# Linux struct can_frame: 32-bit ID, 8-bit DLC, 3 pad bytes, 8 data bytes
+_CAN_FRAME = struct.Struct('=IB3x8s')
+_CAN_EFF_FLAG = 0x80000000  # Extended (29-bit) frame format flag
+
+# Bound references for the per-frame TX path
+_now = datetime.now
+_sleep = time.sleep
+_perf_counter = time.perf_counter
+
 
 class CANTransmitter:
     """
@@ -24,12 +44,36 @@ class CANTransmitter:
     retry logic, and error reporting.
     """
 
+    __slots__ = (
+        'can_interface', 'can_port', 'retry_count', 'retry_delay_ms',
+        'precise_timing', 'debug_level', 'bus', 'connected', 'owns_bus',
+        '_counters', '_last_error', '_last_tx_time', '_stats_lock',
+        '_tx_msg', '_tx_lock', '_batch_queue', '_batch_thread', '_batch_lock',
+    )
+
+    # Statistics counter indices
+    IDX_FRAMES_SENT = 0
+    IDX_FRAMES_FAILED = 1
+    IDX_RETRIES = 2
+
+    # Statistics names, in counter index order
+    STAT_NAMES = ('frames_sent', 'frames_failed', 'retries')
+
+    # Delays below this are finished with a busy-wait when precise_timing is on
+    SPIN_THRESHOLD_MS = 5
+    # Portion of the delay left for the busy-wait after the coarse sleep
+    SPIN_SLACK_S = 0.002
+
+    # Maximum sequences waiting for the batch transmit thread
+    BATCH_QUEUE_SIZE = 1024
+
     def __init__(self,
                  can_interface: str = None,
                  can_port: str = None,
                  bus: can.interface.Bus = None,
                  retry_count: int = 3,
                  retry_delay_ms: int = 100,
+                 precise_timing: bool = False,
                  debug_level: int = 0):
         """
         Initialize CAN transmitter
@@ -40,12 +84,15 @@ class CANTransmitter:
             bus: Existing CAN bus object to use (if provided, no new connection created)
             retry_count: Number of retries for failed transmissions
             retry_delay_ms: Delay between retries in milliseconds
+            precise_timing: If True, finish short delays with a busy-wait spin
+                            to avoid scheduler jitter (uses more CPU)
             debug_level: Debug output level (0=none, 1=errors, 2=all)
         """
         self.can_interface = can_interface
         self.can_port = can_port
         self.retry_count = retry_count
         self.retry_delay_ms = retry_delay_ms
+        self.precise_timing = precise_timing
         self.debug_level = debug_level
 
         # Use provided bus object or create our own later
@@ -53,13 +100,20 @@ class CANTransmitter:
         self.connected = (bus is not None)
         self.owns_bus = (bus is None)  # Track if we created the bus
 
-        self.stats = {
-            'frames_sent': 0,
-            'frames_failed': 0,
-            'retries': 0,
-            'last_error': None,
-            'last_tx_time': None
-        }
+        # Statistics (fixed int64 counters indexed by IDX_* constants)
+        self._counters = array.array('q', [0] * len(self.STAT_NAMES))
+        self._last_error = None
+        self._last_tx_time = None
+        self._stats_lock = threading.Lock()
+
+        # Reusable message, updated in place per frame (guarded by _tx_lock)
+        self._tx_msg = can.Message(arbitration_id=0, data=bytearray(8), is_extended_id=True)
+        self._tx_lock = threading.Lock()
+
+        # Batch transmit queue, created with its thread on first use
+        self._batch_queue = None
+        self._batch_thread = None
+        self._batch_lock = threading.Lock()
 
     def connect(self) -> Tuple[bool, Optional[str]]:
         """
@@ -92,7 +146,7 @@ class CANTransmitter:
         except serial.serialutil.SerialException as e:
             error_msg = f"Failed to connect to CAN bus: {e}"
             self.connected = False
-            self.stats['last_error'] = error_msg
+            self._last_error = error_msg
 
             if self.debug_level > 0:
                 print(f"CAN TX: {error_msg}")
@@ -102,15 +156,33 @@ class CANTransmitter:
         except Exception as e:
             error_msg = f"Unexpected error connecting to CAN bus: {e}"
             self.connected = False
-            self.stats['last_error'] = error_msg
+            self._last_error = error_msg
 
             if self.debug_level > 0:
                 print(f"CAN TX: {error_msg}")
 
             return False, error_msg
 
+    def close(self):
+        """
+        Stop the batch transmit thread after it sends everything queued
+
+        Blocks until sequences already passed to send_frames_batch() have
+        been transmitted and their futures resolved. A later
+        send_frames_batch() call starts a new thread.
+        """
+        with self._batch_lock:
+            batch_queue, thread = self._batch_queue, self._batch_thread
+            self._batch_queue = None
+            self._batch_thread = None
+        if batch_queue is None:
+            return
+        batch_queue.put(None)
+        thread.join()
+
     def disconnect(self):
         """Disconnect from CAN bus (only if we own it)"""
+        self.close()
         if self.bus and self.connected and self.owns_bus:
             try:
                 self.bus.shutdown()
@@ -134,7 +206,7 @@ class CANTransmitter:
 
         Args:
             can_id: CAN arbitration ID (29-bit)
-            data: List of 8 data bytes (0-255)
+            data: 8 data bytes (bytes, or list of ints 0-255)
 
         Returns:
             (success, error_message)
@@ -149,62 +221,93 @@ class CANTransmitter:
         if len(data) != 8:
             return False, f"Data must be 8 bytes, got {len(data)}"
 
-        for i, byte in enumerate(data):
-            if not isinstance(byte, int) or not (0 <= byte <= 255):
-                return False, f"Data byte {i} must be 0-255, got {byte}"
-
-        # Create CAN message
+        # Encoder frames are already bytes; lists are converted here, and
+        # bytes() rejects non-int and out-of-range (0-255) values in one C call
         try:
-            msg = can.Message(
-                arbitration_id=can_id,
-                data=data,
-                is_extended_id=True
-            )
-        except Exception as e:
-            return False, f"Failed to create CAN message: {e}"
+            payload = data if type(data) is bytes else bytes(data)
+        except (TypeError, ValueError) as e:
+            return False, f"Invalid data bytes: {e}"
+
+        if SocketcanBus is not None and isinstance(self.bus, SocketcanBus):
+            # SocketCAN: write the raw can_frame directly, skipping
+            # can.Message construction
+            frame = _CAN_FRAME.pack(can_id | _CAN_EFF_FLAG, 8, payload)
+            success = self._send_with_retry(frame, self._send_raw)
+        else:
+            # Reuse the preallocated message instead of building a new one
+            with self._tx_lock:
+                msg = self._tx_msg
+                msg.arbitration_id = can_id
+                msg.data[:] = payload
+                msg.dlc = 8
 
-        # Send with retry logic
-        success = self._send_with_retry(msg)
+                # Send with retry logic
+                success = self._send_with_retry(msg)
 
         if success:
-            self.stats['frames_sent'] += 1
-            self.stats['last_tx_time'] = datetime.now()
+            with self._stats_lock:
+                self._counters[self.IDX_FRAMES_SENT] += 1
+                self._last_tx_time = _now()
 
             if self.debug_level > 1:
-                data_hex = ''.join(f'{b:02X}' for b in data)
+                data_hex = payload.hex().upper()
                 print(f"CAN TX: {can_id:08X}#{data_hex}")
 
             return True, None
         else:
-            self.stats['frames_failed'] += 1
             error_msg = f"Failed to send CAN frame after {self.retry_count} attempts"
-            self.stats['last_error'] = error_msg
+            with self._stats_lock:
+                self._counters[self.IDX_FRAMES_FAILED] += 1
+                self._last_error = error_msg
             return False, error_msg
 
-    def _send_with_retry(self, msg: can.Message) -> bool:
+    def _send_raw(self, frame: bytes):
+        """
+        Write a packed can_frame to the SocketCAN socket
+
+        Args:
+            frame: Packed struct can_frame (16 bytes)
+
+        Raises:
+            can.CanOperationError: If the write fails or is incomplete
+        """
+        try:
+            sent = self.bus.socket.send(frame)
+        except OSError as e:
+            raise can.CanOperationError(f"Failed to transmit: {e}") from e
+        if sent != _CAN_FRAME.size:
+            raise can.CanOperationError(
+                f"Failed to transmit: wrote {sent} of {_CAN_FRAME.size} bytes")
+
+    def _send_with_retry(self, msg, send=None) -> bool:
         """
         Send CAN message with retry logic
 
         Args:
-            msg: CAN message to send
+            msg: CAN message to send (or packed frame when send is given)
+            send: Send function to use (defaults to bus.send)
 
         Returns:
             True if successful, False otherwise
         """
+        if send is None:
+            send = self.bus.send
+
         for attempt in range(self.retry_count):
             try:
-                self.bus.send(msg)
+                send(msg)
                 return True
 
             except can.CanError as e:
-                self.stats['retries'] += 1
+                with self._stats_lock:
+                    self._counters[self.IDX_RETRIES] += 1
 
                 if self.debug_level > 1:
                     print(f"CAN TX: Send failed (attempt {attempt + 1}/{self.retry_count}): {e}")
 
                 # If not last attempt, wait and retry
                 if attempt < self.retry_count - 1:
-                    time.sleep(self.retry_delay_ms / 1000.0)
+                    self._delay(self.retry_delay_ms)
                 else:
                     # Last attempt failed
                     if self.debug_level > 0:
@@ -218,8 +321,33 @@ class CANTransmitter:
 
         return False
 
+    def _delay(self, delay_ms: float):
+        """
+        Wait between frames or retries
+
+        With precise_timing enabled, short delays sleep for most of the
+        interval and spin on perf_counter() for the remainder, avoiding the
+        kernel scheduling jitter of time.sleep(). Otherwise a plain sleep is
+        used so the thread yields the CPU.
+
+        Args:
+            delay_ms: Delay in milliseconds
+        """
+        delay_s = delay_ms / 1000.0
+
+        if not self.precise_timing or delay_ms >= self.SPIN_THRESHOLD_MS:
+            _sleep(delay_s)
+            return
+
+        deadline = _perf_counter() + delay_s
+        slack = delay_s - self.SPIN_SLACK_S
+        if slack > 0:
+            _sleep(slack)
+        while _perf_counter() < deadline:
+            pass
+
     def send_frames(self,
-                    frames: List[Tuple[int, List[int], int]]) -> Tuple[bool, Optional[str]]:
+                    frames: List[Tuple[int, bytes, int]]) -> Tuple[bool, Optional[str]]:
         """
         Send multiple CAN frames with delays
 
@@ -243,7 +371,12 @@ class CANTransmitter:
         if not frames:
             return False, "No frames to send"
 
-        start_time = time.time()
+        # Fast path: most commands are a single frame with nothing to pace
+        if len(frames) == 1:
+            can_id, data, _ = frames[0]
+            return self.send_frame(can_id, data)
+
+        start_time = _perf_counter()
 
         for i, (can_id, data, delay_ms) in enumerate(frames):
             # Send frame
@@ -256,15 +389,63 @@ class CANTransmitter:
             if delay_ms > 0 and i < len(frames) - 1:
                 if self.debug_level > 1:
                     print(f"CAN TX: Waiting {delay_ms}ms before next frame...")
-                time.sleep(delay_ms / 1000.0)
+                self._delay(delay_ms)
 
-        total_time_ms = (time.time() - start_time) * 1000
+        total_time_ms = (_perf_counter() - start_time) * 1000
 
         if self.debug_level > 1:
             print(f"CAN TX: Sent {len(frames)} frames in {total_time_ms:.1f}ms")
 
         return True, None
 
+    def send_frames_batch(self,
+                          frames: List[Tuple[int, bytes, int]]) -> Future:
+        """
+        Queue a multi-frame sequence for the batch transmit thread
+
+        The sequence is sent by send_frames() on a background thread, so
+        inter-frame delays are paced there instead of in the caller.
+        Sequences are transmitted one at a time in submission order.
+
+        Args:
+            frames: List of (can_id, data_bytes, delay_ms) tuples
+
+        Returns:
+            Future resolving to (success, error_message)
+
+        Raises:
+            queue.Full: If BATCH_QUEUE_SIZE sequences are already waiting
+        """
+        batch_queue = self._batch_queue
+        if batch_queue is None:
+            with self._batch_lock:
+                if self._batch_queue is None:
+                    self._batch_queue = queue.Queue(maxsize=self.BATCH_QUEUE_SIZE)
+                    self._batch_thread = threading.Thread(
+                        target=self._batch_worker, args=(self._batch_queue,),
+                        name='can-tx', daemon=True
+                    )
+                    self._batch_thread.start()
+                batch_queue = self._batch_queue
+
+        future = Future()
+        batch_queue.put_nowait((frames, future))
+        return future
+
+    def _batch_worker(self, batch_queue: queue.Queue):
+        """Background loop transmitting sequences queued by send_frames_batch"""
+        while True:
+            item = batch_queue.get()
+            if item is None:
+                return  # Stop sentinel from close()
+            frames, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.send_frames(frames))
+            except Exception as e:
+                future.set_exception(e)
+
     def send_command_string(self,
                            can_id: int,
                            data_hex: str) -> Tuple[bool, Optional[str]]:
@@ -285,12 +466,12 @@ class CANTransmitter:
                 0x19FEDB63, '02FFC803FF00FFFF'
             )
         """
-        # Convert hex string to byte array
+        # Convert hex string to bytes (parsed in C by bytes.fromhex)
         try:
             if len(data_hex) != 16:
                 return False, f"Data hex string must be 16 characters, got {len(data_hex)}"
 
-            data = [int(data_hex[i:i+2], 16) for i in range(0, 16, 2)]
+            data = bytes.fromhex(data_hex)
         except ValueError as e:
             return False, f"Invalid hex string: {e}"
 
@@ -303,17 +484,19 @@ class CANTransmitter:
         Returns:
             Dictionary with stats
         """
-        return self.stats.copy()
+        with self._stats_lock:
+            stats = dict(zip(self.STAT_NAMES, self._counters))
+            stats['last_error'] = self._last_error
+            stats['last_tx_time'] = self._last_tx_time
+        return stats
 
     def reset_stats(self):
         """Reset transmission statistics"""
-        self.stats = {
-            'frames_sent': 0,
-            'frames_failed': 0,
-            'retries': 0,
-            'last_error': None,
-            'last_tx_time': self.stats.get('last_tx_time')  # Preserve last TX time
-        }
+        with self._stats_lock:
+            for i in range(len(self._counters)):
+                self._counters[i] = 0
+            self._last_error = None
+            # last_tx_time is preserved
 
     def __enter__(self):
         """Context manager entry"""
@@ -11,9 +11,13 @@ Phase 2: Bidirectional Communication
 """
 
 import time
+import functools
 import json
+import queue
 import re
-from typing import Dict, Any, Optional, Tuple, List
+import threading
+from operator import itemgetter
+from typing import Dict, Any, Optional, Tuple, List, Union
 from datetime import datetime
 
 # Phase 2 components
@@ -21,12 +25,166 @@ from rvc_commands import RVCCommandEncoder
 from command_validator import CommandValidator, ValidationError
 from audit_logger import AuditLogger
 
+# Bound references for the per-command path
+_perf_counter_ns = time.perf_counter_ns
+_time_ns = time.time_ns
+_fromtimestamp = datetime.fromtimestamp
+
+# Fast JSON serialization (optional - falls back to stdlib json)
+try:
+    import orjson
+    _dumpb = orjson.dumps
+except ImportError:
+    orjson = None
+
+    def _dumpb(obj: Any) -> bytes:
+        """Serialize to compact JSON bytes using the stdlib encoder"""
+        return json.dumps(obj, separators=(',', ':')).encode()
+
 # CAN transmitter (optional for testing)
 try:
     from can_tx import CANTransmitter
 except ImportError:
     CANTransmitter = None  # Not available in test environment
 
+# Maximum success acknowledgments waiting for the ack worker (async_ack)
+ACK_QUEUE_SIZE = 1024
+
+# Acknowledgment topics
+STATUS_TOPIC = 'rv/command/status'
+ERROR_TOPIC = 'rv/command/error'
+
+# Unpacks a parsed command dict in one call
+_command_fields = itemgetter('entity_id', 'command_type', 'action', 'value')
+_error_fields = itemgetter('entity_id', 'command_type')
+
+# Error acknowledgment skeleton, filled in directly when no field needs
+# JSON escaping (see _publish_error)
+_ERROR_TEMPLATE = ('{"entity_id":"%s","command_type":"%s","error_code":"%s",'
+                   '"error_message":"%s","timestamp":"%s"}')
+
+# Success acknowledgment skeleton; value is pre-rendered as a JSON literal
+# (see _publish_success)
+_SUCCESS_TEMPLATE = ('{"entity_id":"%s","command_type":"%s","action":"%s",'
+                     '"value":%s,"status":"success","latency_ms":%r,'
+                     '"timestamp":"%s"}')
+
+# Characters that must be escaped inside a JSON string
+_JSON_UNSAFE_RE = re.compile(r'["\\\x00-\x1f]')
+
+# Entity types accepted in command topics (rv/{entity_type}/...). Every
+# type accepts every action segment; per-type action rules are enforced by
+# CommandValidator so invalid combinations get validation errors.
+_ENTITY_TYPES = frozenset(('light', 'climate', 'switch', 'fan', 'cover'))
+
+# Trailing instance number in entity IDs (light_ceiling_1 -> 1)
+_INSTANCE_RE = re.compile(r'_(\d+)$')
+
+
+def _parse_speed_range(payload: str) -> str:
+    """
+    Convert a fan speed_range payload to a speed name
+
+    HA sends 0, 1, or 2 (not percentage 0-100). With speed_range_max=2:
+    0=OFF, 1=LOW (50%), 2=HIGH (100%)
+    """
+    speed_range_value = int(payload)
+    if speed_range_value == 0:
+        return 'OFF'
+    elif speed_range_value == 1:
+        return 'LOW'
+    return 'HIGH'
+
+
+# Fan speed names (and their digit forms) -> speed (0=OFF, 1=LOW, 2=HIGH)
+# (common spellings included so exact matches skip lower()/strip())
+_FAN_SPEED_NAMES = {
+    'off': 0, 'OFF': 0, 'Off': 0, '0': 0,
+    'low': 1, 'LOW': 1, 'Low': 1, '1': 1,
+    'high': 2, 'HIGH': 2, 'High': 2, '2': 2,
+}
+
+# Canonical ON/OFF for common state payload spellings
+_STATE_NAMES = {
+    'ON': 'ON', 'on': 'ON', 'On': 'ON',
+    'OFF': 'OFF', 'off': 'OFF', 'Off': 'OFF',
+}
+
+# Payload parser for each topic action (int() and float() accept
+# surrounding whitespace themselves, so numeric payloads aren't stripped)
+_PAYLOAD_PARSERS = {
+    'state': lambda p: _STATE_NAMES.get(p) or p.strip().upper(),  # ON/OFF commands
+    'brightness': int,                              # Numeric brightness (0-100)
+    'percentage': _parse_speed_range,               # Fan speed_range (0-2)
+    'temperature': float,                           # Numeric temperature
+    'mode': lambda p: p.strip().lower(),            # String mode values
+    'fan_mode': lambda p: p.strip().lower(),
+    'position': lambda p: p.strip().lower(),        # Cover position: open/close
+}
+
+# Topic action segment -> (command action, payload parser). The bare
+# rv/{type}/{id}/set form is the state command; there is no 'state'
+# segment, since rv/{type}/{id}/state is the published state topic.
+# Fan percentage (speed range) is validated as a state command.
+_SEGMENT_ACTIONS = {
+    'set': ('state', _PAYLOAD_PARSERS['state']),
+    'brightness': ('brightness', _PAYLOAD_PARSERS['brightness']),
+    'percentage': ('state', _PAYLOAD_PARSERS['percentage']),
+    'temperature': ('temperature', _PAYLOAD_PARSERS['temperature']),
+    'mode': ('mode', _PAYLOAD_PARSERS['mode']),
+    'fan_mode': ('fan_mode', _PAYLOAD_PARSERS['fan_mode']),
+    'position': ('position', _PAYLOAD_PARSERS['position']),
+}
+
+@functools.lru_cache(maxsize=4096)
+def _parse_topic_payload(topic: str, payload: str) -> Union[Tuple[str, str, str, Any], str]:
+    """
+    Parse an MQTT command topic and payload (cached - inputs recur constantly)
+
+    Args:
+        topic: MQTT topic
+        payload: MQTT payload
+
+    Returns:
+        (entity_id, command_type, action, value), or an error message string
+        if parsing fails
+    """
+    # Parse topic pattern: rv/{entity_type}/{entity_id}[/{action}]/set
+    # Cheap prefix/suffix check first rejects non-command topics
+    if not (topic.startswith('rv/') and topic.endswith('/set')):
+        return f"Invalid topic format: {topic}"
+
+    # At most 5 segments are valid; cap the split so oversized topics
+    # don't allocate one string per extra segment
+    parts = topic.split('/', 5)
+    n_parts = len(parts)
+
+    if not ((n_parts == 4 or n_parts == 5)
+            and parts[1] in _ENTITY_TYPES
+            and parts[2] and parts[3]):
+        return f"Invalid topic format: {topic}"
+
+    entity_type = parts[1]
+    entity_id = parts[2]
+    action_or_set = parts[3]
+
+    # Determine action based on topic structure:
+    #   rv/light/ceiling/set             -> state
+    #   rv/light/ceiling/brightness/set  -> brightness
+    #   rv/climate/hvac_front/mode/set   -> mode (etc.)
+    entry = _SEGMENT_ACTIONS.get(action_or_set)
+    if entry is None:
+        return f"Unknown action: {action_or_set}"
+    action, parser = entry
+
+    # Parse payload based on action
+    try:
+        value = parser(payload)
+    except (ValueError, TypeError, AttributeError) as e:
+        return f"Failed to parse payload '{payload}': {e}"
+
+    return (entity_id, entity_type, action, value)
+
 
 class CommandHandler:
     """
@@ -48,7 +206,11 @@ class CommandHandler:
                  audit_logger: AuditLogger,
                  ha_discovery=None,
                  mqtt_client=None,
-                 debug_level: int = 0):
+                 debug_level: int = 0,
+                 audit_flush_interval_ms: int = 50,
+                 async_tx: bool = False,
+                 async_ack: bool = False,
+                 ack_qos: int = 0):
         """
         Initialize command handler
 
@@ -60,6 +222,22 @@ class CommandHandler:
             ha_discovery: HADiscovery instance (for entity lookup)
             mqtt_client: MQTT client for publishing acknowledgments
             debug_level: Debug output level
+            audit_flush_interval_ms: How often buffered audit entries are
+                written when the audit logger batches writes. Longer
+                intervals mean fewer writes but more entries at risk if
+                the process dies.
+            async_tx: If True, encoded commands are queued on the
+                transmitter's batch thread (send_frames_batch); an 'accepted'
+                status is published before enqueueing and the success/error
+                ack follows after transmission. Transmitters without a batch
+                thread send inline.
+            async_ack: If True, the success audit entry and MQTT ack are
+                written by a background worker so the transmit path does not
+                wait on them. Falls back to writing inline if the worker
+                falls ACK_QUEUE_SIZE acks behind.
+            ack_qos: MQTT QoS for status/error acknowledgments. Acks are
+                idempotent status reports, so the default of 0 avoids a
+                broker round trip per command.
         """
         self.encoder = encoder
         self.validator = validator
@@ -69,26 +247,60 @@ class CommandHandler:
         self.mqtt_client = mqtt_client
         self.debug_level = debug_level
 
-        # Statistics
-        self.stats = {
-            'total_commands': 0,
-            'successful_commands': 0,
-            'validation_failures': 0,
-            'transmission_failures': 0,
-            'encoding_failures': 0,
-        }
+        # Debug output sink: print when debugging, None otherwise. Call sites
+        # test it first so messages aren't formatted when disabled.
+        self._dbg = print if debug_level > 0 else None
+        self.audit_flush_interval_ms = audit_flush_interval_ms
+        self.async_tx = async_tx
+        self.async_ack = async_ack
+        self.ack_qos = ack_qos
+
+        # Statistics (plain int counters; see get_stats)
+        self.reset_stats()
+
+        # (epoch_second, iso_prefix) of the last formatted acknowledgment time
+        self._ts_cache = (0, '')
+
+        # (command_type, action) -> frame encoder (see _build_encoders)
+        self._encoders = self._build_encoders()
+
+        # Periodically write out batched audit entries
+        self._audit_flush_stop = threading.Event()
+        if getattr(audit_logger, 'batch_size', 1) > 1 and audit_flush_interval_ms > 0:
+            threading.Thread(
+                target=self._audit_flush_loop, name='audit-flush', daemon=True
+            ).start()
+
+        # Background transmission (async_tx only): hand sequences to the
+        # transmitter's own pacing thread
+        self._send_batch = None
+        if async_tx and hasattr(transmitter, 'send_frames_batch'):
+            self._send_batch = transmitter.send_frames_batch
+
+        # Background success acknowledgment queue (async_ack only)
+        self._ack_queue = None
+        if async_ack:
+            self._ack_queue = queue.Queue(maxsize=ACK_QUEUE_SIZE)
+            threading.Thread(
+                target=self._ack_worker, name='command-ack', daemon=True
+            ).start()
 
     # =========================================================================
     # Main Command Processing
     # =========================================================================
 
-    def process_mqtt_command(self, topic: str, payload: str) -> bool:
+    def process_mqtt_command(self, topic: str, payload: str,
+                             source: str = 'mqtt', skip_checks: int = 0) -> bool:
         """
         Process MQTT command message
 
         Args:
             topic: MQTT topic (e.g., "rv/light/ceiling/set")
             payload: MQTT payload (e.g., "ON" or "75")
+            source: Command source recorded in the audit log
+            skip_checks: CommandValidator.SKIP_* bitmask of validation layers
+                to bypass. Only for trusted internal callers (replays,
+                test harnesses); MQTT-origin commands use the default 0.
 
         Returns:
             True if command processed successfully, False otherwise
@@ -100,27 +312,37 @@ class CommandHandler:
             4. Transmit frames
             5. Log and acknowledge
         """
-        start_time = time.time()
-        self.stats['total_commands'] += 1
+        start_ns = _perf_counter_ns()
+        self._total_commands += 1
+
+        # Hot attributes bound once per call
+        audit = self.audit_logger
+        dbg = self._dbg
+        send_batch = self._send_batch
+
+        # Step 1: Parse MQTT message (returns None rather than raising)
+        command = self._parse_mqtt_message(topic, payload)
+        if not command:
+            return False
 
         try:
-            # Step 1: Parse MQTT message
-            command = self._parse_mqtt_message(topic, payload)
-            if not command:
-                return False
+            entity_id, command_type, _, value = _command_fields(command)
 
             # Step 2: Log command attempt
-            cmd_id = self.audit_logger.log_command_attempt(command, source='mqtt')
+            cmd_id = audit.log_command_attempt(command, source=source)
 
-            if self.debug_level > 0:
-                print(f"[CMD {cmd_id}] Processing: {command.get('entity_id')} "
-                      f"({command.get('command_type')}) = {command.get('value')}")
+            if dbg:
+                dbg(f"[CMD {cmd_id}] Processing: {entity_id} "
+                    f"({command_type}) = {value}")
 
             # Step 3: Validate command
-            valid, error = self.validator.validate(command)
+            if skip_checks:
+                valid, error = self.validator.validate(command, skip=skip_checks)
+            else:
+                valid, error = self.validator.validate(command)
             if not valid:
-                self.stats['validation_failures'] += 1
-                self.audit_logger.log_validation_failure(
+                self._validation_failures += 1
+                audit.log_validation_failure(
                     cmd_id, command, error.code, error.message, error.field
                 )
                 self._publish_error(command, error.code, error.message)
@@ -130,53 +352,162 @@ class CommandHandler:
             try:
                 frames = self._encode_command(command)
                 if not frames:
-                    self.stats['encoding_failures'] += 1
-                    self.audit_logger.log_transmission_failure(
+                    self._encoding_failures += 1
+                    audit.log_transmission_failure(
                         cmd_id, command, "Failed to encode command"
                     )
                     self._publish_error(command, 'E100', 'Encoding failed')
                     return False
             except Exception as e:
-                self.stats['encoding_failures'] += 1
-                self.audit_logger.log_transmission_failure(
+                self._encoding_failures += 1
+                audit.log_transmission_failure(
                     cmd_id, command, f"Encoding error: {e}"
                 )
                 self._publish_error(command, 'E100', f'Encoding error: {e}')
                 return False
 
-            # Step 5: Transmit frames
-            success, tx_error = self.transmitter.send_frames(frames)
-            if not success:
-                self.stats['transmission_failures'] += 1
-                frame_strs = [self._format_frame(f[0], f[1]) for f in frames]
-                self.audit_logger.log_transmission_failure(
-                    cmd_id, command, tx_error, frame_strs
+            # Steps 5-6: Transmit, log, and acknowledge
+            if send_batch is None:
+                return self._transmit(cmd_id, command, frames, start_ns)
+
+            # Publish 'accepted' before handing off, so it can't arrive
+            # after the worker's success/error ack
+            self._publish_accepted(command)
+            try:
+                future = send_batch(frames)
+                future.add_done_callback(
+                    lambda f: self._batch_done(f, cmd_id, command, frames, start_ns)
+                )
+            except queue.Full:
+                self._transmission_failures += 1
+                audit.log_transmission_failure(
+                    cmd_id, command, "Transmit queue full"
                 )
-                self._publish_error(command, 'E101', tx_error)
+                self._publish_error(command, 'E102', 'Transmit queue full')
                 return False
 
-            # Step 6: Success - log and acknowledge
-            latency_ms = (time.time() - start_time) * 1000
-            self.stats['successful_commands'] += 1
-            frame_strs = [self._format_frame(f[0], f[1]) for f in frames]
-            self.audit_logger.log_command_success(cmd_id, command, frame_strs, latency_ms)
-            self._publish_success(command, latency_ms)
+            return True
 
-            # Publish percentage state for multi-speed fans
-            if command['command_type'] == 'fan' and self._is_multi_speed_fan(command['entity_id']):
-                self._publish_fan_percentage(command['entity_id'], command['value'])
+        except Exception as e:
+            # Last resort for unexpected audit/transmit errors; the ack
+            # names the command that failed
+            if dbg:
+                dbg(f"[CMD] Unexpected error: {e}")
+            self._publish_error(command, 'E999', f'Unexpected error: {e}')
+            return False
 
-            if self.debug_level > 0:
-                print(f"[CMD {cmd_id}] Success: {len(frames)} frames in {latency_ms:.1f}ms")
+    def _transmit(self, cmd_id: int, command: Dict[str, Any],
+                  frames: List[Tuple[int, bytes, int]], start_ns: int) -> bool:
+        """
+        Transmit encoded frames, then log and acknowledge the result
 
-            return True
+        Args:
+            cmd_id: Command ID from log_command_attempt
+            command: Command dictionary
+            frames: Encoded (can_id, data_bytes, delay_ms) tuples
+            start_ns: perf_counter_ns() when the command was received
 
-        except Exception as e:
-            if self.debug_level > 0:
-                print(f"[CMD] Unexpected error: {e}")
-            self._publish_error({'entity_id': 'unknown'}, 'E999', f'Unexpected error: {e}')
+        Returns:
+            True if all frames were sent
+        """
+        # Step 5: Transmit frames
+        success, tx_error = self.transmitter.send_frames(frames)
+        return self._finish_transmit(cmd_id, command, frames, start_ns,
+                                     success, tx_error)
+
+    def _finish_transmit(self, cmd_id: int, command: Dict[str, Any],
+                         frames: List[Tuple[int, bytes, int]], start_ns: int,
+                         success: bool, tx_error: Optional[str]) -> bool:
+        """
+        Log and acknowledge the result of a transmission
+
+        Args:
+            cmd_id: Command ID from log_command_attempt
+            command: Command dictionary
+            frames: Encoded (can_id, data_bytes, delay_ms) tuples
+            start_ns: perf_counter_ns() when the command was received
+            success: Whether all frames were sent
+            tx_error: Transmitter error message on failure
+
+        Returns:
+            success
+        """
+        if not success:
+            self._transmission_failures += 1
+            self.audit_logger.log_transmission_failure(
+                cmd_id, command, tx_error,
+                lambda: [self._format_frame(f[0], f[1]) for f in frames]
+            )
+            self._publish_error(command, 'E101', tx_error)
             return False
 
+        # Step 6: Success - log and acknowledge
+        latency_ms = (_perf_counter_ns() - start_ns) / 1_000_000
+        self._successful_commands += 1
+
+        if self._ack_queue is not None:
+            try:
+                self._ack_queue.put_nowait((cmd_id, command, frames, latency_ms))
+                return True
+            except queue.Full:
+                self._ack_overflows += 1
+
+        self._acknowledge_success(cmd_id, command, frames, latency_ms)
+        return True
+
+    def _acknowledge_success(self, cmd_id: int, command: Dict[str, Any],
+                             frames: List[Tuple[int, bytes, int]], latency_ms: float):
+        """
+        Write the success audit entry and publish the MQTT acknowledgment
+
+        Args:
+            cmd_id: Command ID from log_command_attempt
+            command: Command dictionary
+            frames: Transmitted (can_id, data_bytes, delay_ms) tuples
+            latency_ms: Receive-to-transmit latency
+        """
+        # Frame strings are only formatted if the audit entry is logged
+        self.audit_logger.log_command_success(
+            cmd_id, command,
+            lambda: [self._format_frame(f[0], f[1]) for f in frames],
+            latency_ms
+        )
+        self._publish_success(command, latency_ms)
+
+        # Publish percentage state for multi-speed fans
+        if self.mqtt_client:
+            entity_id, command_type, _, value = _command_fields(command)
+            if command_type == 'fan' and self._is_multi_speed_fan(entity_id):
+                self._publish_fan_percentage(entity_id, value)
+
+        if self._dbg:
+            self._dbg(f"[CMD {cmd_id}] Success: {len(frames)} frames in {latency_ms:.1f}ms")
+
+    def _batch_done(self, future, cmd_id: int, command: Dict[str, Any],
+                    frames: List[Tuple[int, bytes, int]], start_ns: int):
+        """Completion callback for sequences sent by transmitter.send_frames_batch"""
+        try:
+            success, tx_error = future.result()
+            self._finish_transmit(cmd_id, command, frames, start_ns,
+                                  success, tx_error)
+        except Exception as e:
+            if self._dbg:
+                self._dbg(f"[CMD {cmd_id}] Unexpected transmit error: {e}")
+            self._publish_error(command, 'E999', f'Unexpected error: {e}')
+
+    def _ack_worker(self):
+        """Background loop writing queued success acknowledgments (async_ack)"""
+        ack_queue = self._ack_queue
+        while True:
+            cmd_id, command, frames, latency_ms = ack_queue.get()
+            try:
+                self._acknowledge_success(cmd_id, command, frames, latency_ms)
+            except Exception as e:
+                if self._dbg:
+                    self._dbg(f"[CMD {cmd_id}] Acknowledgment error: {e}")
+            finally:
+                ack_queue.task_done()
+
     # =========================================================================
     # MQTT Message Parsing
     # =========================================================================
@@ -200,77 +531,14 @@ class CommandHandler:
         Returns:
             Command dictionary or None if parsing fails
         """
-        # Parse topic pattern: rv/{entity_type}/{entity_id}/{action}/set
-        pattern = r'^rv/(light|climate|switch|fan|cover)/([^/]+)/([^/]+)(?:/set)?$'
-        match = re.match(pattern, topic)
-
-        if not match:
-            if self.debug_level > 0:
-                print(f"Invalid topic format: {topic}")
-            return None
-
-        entity_type = match.group(1)
-        entity_id = match.group(2)
-        action_or_set = match.group(3)
-
-        # Determine action based on topic structure
-        if action_or_set == 'set':
-            # Simple format: rv/light/ceiling/set or rv/fan/vent1/set
-            action = 'state'
-        elif action_or_set == 'brightness':
-            # Brightness: rv/light/ceiling/brightness/set
-            action = 'brightness'
-        elif action_or_set == 'percentage':
-            # Fan percentage: rv/fan/fan_bedroom_ceiling/percentage/set
-            action = 'percentage'
-        elif action_or_set in ['mode', 'temperature', 'fan_mode']:
-            # Climate actions: rv/climate/hvac_front/mode/set
-            action = action_or_set
-        elif action_or_set == 'position':
-            # Cover position: rv/cover/vent_lid1/position/set
-            action = 'position'
-        else:
-            if self.debug_level > 0:
-                print(f"Unknown action: {action_or_set}")
-            return None
-
-        # Parse payload based on action
-        try:
-            if action in ['state']:
-                # ON/OFF commands
-                value = payload.strip().upper()
-            elif action == 'brightness':
-                # Numeric brightness (0-100)
-                value = int(payload.strip())
-            elif action == 'percentage':
-                # Fan speed_range value: HA sends 0, 1, or 2 (not percentage 0-100)
-                # With speed_range_max=2: 0=OFF, 1=LOW (50%), 2=HIGH (100%)
-                speed_range_value = int(payload.strip())
-                if speed_range_value == 0:
-                    value = 'OFF'
-                elif speed_range_value == 1:
-                    value = 'LOW'
-                else:  # speed_range_value == 2
-                    value = 'HIGH'
-                # Treat as state command for validation
-                action = 'state'
-            elif action == 'temperature':
-                # Numeric temperature
-                value = float(payload.strip())
-            elif action in ['mode', 'fan_mode']:
-                # String mode values
-                value = payload.strip().lower()
-            elif action == 'position':
-                # Cover position: open/close
-                value = payload.strip().lower()
-            else:
-                value = payload.strip()
-        except (ValueError, AttributeError) as e:
-            if self.debug_level > 0:
-                print(f"Failed to parse payload '{payload}': {e}")
+        result = _parse_topic_payload(topic, payload)
+        if type(result) is str:
+            if self._dbg:
+                self._dbg(result)
             return None
 
         # Build command dictionary
+        entity_id, entity_type, action, value = result
         command = {
             'entity_id': entity_id,
             'command_type': entity_type,
@@ -284,7 +552,7 @@ class CommandHandler:
     # Command Encoding
     # =========================================================================
 
-    def _encode_command(self, command: Dict[str, Any]) -> Optional[List[Tuple[int, List[int], int]]]:
+    def _encode_command(self, command: Dict[str, Any]) -> Optional[List[Tuple[int, bytes, int]]]:
         """
         Encode command to RV-C CAN frames
 
@@ -294,147 +562,160 @@ class CommandHandler:
         Returns:
             List of (can_id, data_bytes, delay_ms) tuples or None if encoding fails
         """
-        # Get instance ID from entity mapping
-        instance = self._get_instance_id(command['entity_id'])
-        if instance is None:
-            if self.debug_level > 0:
-                print(f"No instance mapping for entity: {command['entity_id']}")
+        # Get instance IDs from entity mapping (one lookup for all fields)
+        resolved = self._resolve_entity(command['entity_id'])
+        if resolved[0] is None:
+            if self._dbg:
+                self._dbg(f"No instance mapping for entity: {command['entity_id']}")
             return None
 
         command_type = command['command_type']
         action = command.get('action', 'state')
-        value = command['value']
-
-        try:
-            # Route to appropriate encoder based on command type
-            if command_type == 'light':
-                if action == 'brightness':
-                    return self.encoder.encode_light_brightness(instance, value)
-                else:
-                    # ON/OFF
-                    turn_on = (value == 'ON')
-                    return self.encoder.encode_light_on_off(instance, turn_on)
-
-            elif command_type == 'climate':
-                if action == 'mode':
-                    return self.encoder.encode_climate_mode(instance, value)
-                elif action == 'temperature':
-                    return self.encoder.encode_climate_temperature(instance, value)
-                elif action == 'fan_mode':
-                    return self.encoder.encode_climate_fan_mode(instance, value)
-
-            elif command_type == 'switch':
-                # ON/OFF
-                turn_on = (value == 'ON')
-                return self.encoder.encode_switch_on_off(instance, turn_on)
-
-            elif command_type == 'fan':
-                # Check if this is a ceiling fan (multi-speed) or vent fan (ON/OFF)
-                fan_id = self._get_fan_id(command['entity_id'])
-
-                if fan_id:
-                    # Ceiling fan - supports OFF/LOW/HIGH speeds
-                    speed = self._parse_fan_speed(value)
-                    return self.encoder.encode_ceiling_fan(fan_id, speed)
-                else:
-                    # Vent fan - simple ON/OFF toggle
-                    turn_on = (value == 'ON')
-                    return self.encoder.encode_vent_fan(instance, turn_on)
-
-            elif command_type == 'cover':
-                # Vent lid - needs TWO instances (up motor and down motor)
-                # Get both instances from entity config
-                instances = self._get_cover_instances(command['entity_id'])
-                if not instances or len(instances) != 2:
-                    if self.debug_level > 0:
-                        print(f"Cover requires 2 instances (up, down), got: {instances}")
-                    return None
-
-                up_instance, down_instance = instances
-                return self.encoder.encode_vent_lid(up_instance, down_instance, value)
 
-            else:
-                if self.debug_level > 0:
-                    print(f"Unknown command type: {command_type}")
-                return None
+        # Route to appropriate encoder based on command type and action
+        encoders = self._encoders
+        encode = encoders.get((command_type, action))
+        if encode is None:
+            encode = encoders.get((command_type, None))
+        if encode is None:
+            if self._dbg:
+                self._dbg(f"Unsupported command: {command_type}/{action}")
+            return None
 
+        try:
+            return encode(resolved, command['value'])
         except Exception as e:
-            if self.debug_level > 0:
-                print(f"Encoding error: {e}")
+            if self._dbg:
+                self._dbg(f"Encoding error: {e}")
             raise
 
-    def _get_instance_id(self, entity_id: str) -> Optional[int]:
+    def _build_encoders(self) -> Dict[Tuple[str, Optional[str]], Any]:
         """
-        Get RV-C instance ID for entity
-
-        Args:
-            entity_id: Entity ID from HA
+        Build the frame encoder table from bound encoder methods
 
-        Returns:
-            Instance ID or None if not found
+        Keys are (command_type, action); an action of None is the fallback
+        for command types whose other actions all encode the same way.
+        Every action the validator accepts also has an exact entry, so valid
+        commands resolve in a single lookup. Each entry is called as
+        fn(resolved, value) with resolved from _resolve_entity().
         """
-        if not self.ha_discovery:
-            # If no HA discovery, try to extract instance from entity_id
-            # Format: light_ceiling_1 -> instance 1
-            match = re.search(r'_(\d+)$', entity_id)
-            if match:
-                return int(match.group(1))
-            return 1  # Default to instance 1
+        encoder = self.encoder
+        if encoder is None:
+            return {}
+
+        light_brightness = encoder.encode_light_brightness
+        light_on_off = encoder.encode_light_on_off
+        climate_mode = encoder.encode_climate_mode
+        climate_temperature = encoder.encode_climate_temperature
+        climate_fan_mode = encoder.encode_climate_fan_mode
+        switch_on_off = encoder.encode_switch_on_off
+        encode_fan = self._encode_fan
+        encode_cover = self._encode_cover
+
+        encode_light = lambda r, v: light_on_off(r[0], v == 'ON')
+        encode_switch = lambda r, v: switch_on_off(r[0], v == 'ON')
+
+        return {
+            ('light', 'brightness'): lambda r, v: light_brightness(r[0], v),
+            ('light', 'state'): encode_light,
+            ('light', None): encode_light,
+            ('climate', 'mode'): lambda r, v: climate_mode(r[0], v),
+            ('climate', 'temperature'): lambda r, v: climate_temperature(r[0], v),
+            ('climate', 'fan_mode'): lambda r, v: climate_fan_mode(r[0], v),
+            ('switch', 'state'): encode_switch,
+            ('switch', None): encode_switch,
+            ('fan', 'state'): encode_fan,
+            ('fan', None): encode_fan,
+            ('cover', 'position'): encode_cover,
+            ('cover', None): encode_cover,
+        }
 
-        # Look up entity in HA discovery mapping
-        for entity in self.ha_discovery.entities:
-            if entity.get('entity_id') == entity_id:
-                return entity.get('instance', 1)
+    def _encode_fan(self, resolved: Tuple, value: Any) -> Optional[List[Tuple[int, bytes, int]]]:
+        """Encode a fan command (ceiling fan speed or vent fan ON/OFF)"""
+        # Check if this is a ceiling fan (multi-speed) or vent fan (ON/OFF)
+        instance, fan_id, _ = resolved
+
+        if fan_id:
+            # Ceiling fan - supports OFF/LOW/HIGH speeds
+            speed = self._parse_fan_speed(value)
+            return self.encoder.encode_ceiling_fan(fan_id, speed)
+
+        # Vent fan - simple ON/OFF toggle
+        return self.encoder.encode_vent_fan(instance, value == 'ON')
+
+    def _encode_cover(self, resolved: Tuple, value: Any) -> Optional[List[Tuple[int, bytes, int]]]:
+        """Encode a cover (vent lid) command"""
+        # Vent lid - needs TWO instances (up motor and down motor)
+        # from the entity config
+        instances = resolved[2]
+        if not instances or len(instances) != 2:
+            if self._dbg:
+                self._dbg(f"Cover requires 2 instances (up, down), got: {instances}")
+            return None
 
-        # Not found
-        return None
+        up_instance, down_instance = instances
+        return self.encoder.encode_vent_lid(up_instance, down_instance, value)
 
-    def _get_cover_instances(self, entity_id: str) -> Optional[Tuple[int, int]]:
+    def _resolve_entity(self, entity_id: str) -> Tuple[Optional[int], Optional[int], Optional[Tuple[int, int]]]:
         """
-        Get RV-C instance IDs for cover entity (up motor, down motor)
-
-        Covers require two DC load instances - one for up and one for down.
+        Resolve all RV-C addressing fields for an entity in one lookup
 
         Args:
             entity_id: Entity ID from HA
 
         Returns:
-            Tuple of (up_instance, down_instance) or None if not found
+            (instance, fan_id, cover_instances):
+            - instance: RV-C instance ID, or None if the entity is unknown
+            - fan_id: Ceiling fan ID (1 or 2), or None for other entities
+            - cover_instances: (up_instance, down_instance) for covers, else None
         """
         if not self.ha_discovery:
-            return None
+            # If no HA discovery, try to extract instance from entity_id
+            # Format: light_ceiling_1 -> instance 1
+            match = _INSTANCE_RE.search(entity_id)
+            if match:
+                return int(match.group(1)), None, None
+            return 1, None, None  # Default to instance 1
 
         # Look up entity in HA discovery mapping
-        for entity in self.ha_discovery.entities:
-            if entity.get('entity_id') == entity_id:
-                # Cover entities should have an 'instances' field with [up, down]
-                instances = entity.get('instances')
-                if instances and len(instances) == 2:
-                    return (instances[0], instances[1])
-
-        # Not found or invalid
-        return None
+        entity = self._get_entity(entity_id)
+        if entity is None:
+            return None, None, None
+
+        # Cover entities should have an 'instances' field with [up, down]
+        instances = entity.get('instances')
+        if instances and len(instances) == 2:
+            cover_instances = (instances[0], instances[1])
+        else:
+            cover_instances = None
 
-    def _get_fan_id(self, entity_id: str) -> Optional[int]:
-        """
-        Get fan_id for ceiling fan (if applicable)
+        return entity.get('instance', 1), entity.get('fan_id'), cover_instances
 
-        Args:
-            entity_id: Entity ID from HA
+    def _get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Get entity configuration from HA discovery"""
+        # HADiscovery keeps an entity_id index of the loaded mapping
+        get_entity = getattr(self.ha_discovery, 'get_entity', None)
+        if get_entity is not None:
+            return get_entity(entity_id)
 
-        Returns:
-            fan_id (1 or 2) if ceiling fan, None if vent fan
-        """
-        if not self.ha_discovery:
-            return None
-
-        # Look up entity in HA discovery mapping
         for entity in self.ha_discovery.entities:
             if entity.get('entity_id') == entity_id:
-                return entity.get('fan_id')
+                return entity
 
         return None
 
+    def _get_instance_id(self, entity_id: str) -> Optional[int]:
+        """Get RV-C instance ID for entity (None if not found)"""
+        return self._resolve_entity(entity_id)[0]
+
+    def _get_cover_instances(self, entity_id: str) -> Optional[Tuple[int, int]]:
+        """Get (up_instance, down_instance) for cover entity (None if not a cover)"""
+        return self._resolve_entity(entity_id)[2]
+
+    def _get_fan_id(self, entity_id: str) -> Optional[int]:
+        """Get fan_id for ceiling fan (None if vent fan)"""
+        return self._resolve_entity(entity_id)[1]
+
     def _parse_fan_speed(self, value: Any) -> int:
         """
         Parse fan speed value to 0-2 range
@@ -451,13 +732,11 @@ class CommandHandler:
             Speed (0=OFF, 1=LOW, 2=HIGH)
         """
         if isinstance(value, str):
-            value_lower = value.lower().strip()
-            if value_lower in ['off', '0']:
-                return 0
-            elif value_lower in ['low', '1']:
-                return 1
-            elif value_lower in ['high', '2']:
-                return 2
+            speed = _FAN_SPEED_NAMES.get(value)
+            if speed is None:
+                speed = _FAN_SPEED_NAMES.get(value.lower().strip())
+            if speed is not None:
+                return speed
             else:
                 # Try to parse as number
                 try:
@@ -489,43 +768,87 @@ class CommandHandler:
         if not self.mqtt_client:
             return
 
-        status_topic = 'rv/command/status'
-        payload = json.dumps({
-            'entity_id': command.get('entity_id'),
-            'command_type': command.get('command_type'),
-            'action': command.get('action'),
-            'value': command.get('value'),
-            'status': 'success',
-            'latency_ms': round(latency_ms, 2),
-            'timestamp': datetime.now().isoformat()
+        entity_id, command_type, action, value = _command_fields(command)
+        latency_ms = round(latency_ms, 2)
+        timestamp = self._now_iso()
+
+        # Common case: plain-string fields and a str/int value can be
+        # substituted into the template without a JSON encoder
+        value_type = type(value)
+        if value_type is str:
+            value_json = None if _JSON_UNSAFE_RE.search(value) else f'"{value}"'
+        elif value_type is int:
+            value_json = str(value)
+        else:
+            value_json = None
+
+        if (value_json is not None
+                and not _JSON_UNSAFE_RE.search(entity_id)
+                and not _JSON_UNSAFE_RE.search(command_type)
+                and not _JSON_UNSAFE_RE.search(action)):
+            payload = (_SUCCESS_TEMPLATE % (entity_id, command_type, action,
+                                            value_json, latency_ms, timestamp)).encode()
+        else:
+            payload = _dumpb({
+                'entity_id': entity_id,
+                'command_type': command_type,
+                'action': action,
+                'value': value,
+                'status': 'success',
+                'latency_ms': latency_ms,
+                'timestamp': timestamp
+            })
+
+        self.mqtt_client.publish(STATUS_TOPIC, payload, qos=self.ack_qos, retain=False)
+
+    def _publish_accepted(self, command: Dict[str, Any]):
+        """Publish 'accepted' status for a command queued for transmission"""
+        if not self.mqtt_client:
+            return
+
+        entity_id, command_type, action, value = _command_fields(command)
+        payload = _dumpb({
+            'entity_id': entity_id,
+            'command_type': command_type,
+            'action': action,
+            'value': value,
+            'status': 'accepted',
+            'timestamp': self._now_iso()
         })
 
-        self.mqtt_client.publish(status_topic, payload, retain=False)
+        self.mqtt_client.publish(STATUS_TOPIC, payload, qos=self.ack_qos, retain=False)
 
     def _publish_error(self, command: Dict[str, Any], error_code: str, error_message: str):
         """Publish error to MQTT"""
         if not self.mqtt_client:
             return
 
-        error_topic = 'rv/command/error'
-        payload = json.dumps({
-            'entity_id': command.get('entity_id'),
-            'command_type': command.get('command_type'),
-            'error_code': error_code,
-            'error_message': error_message,
-            'timestamp': datetime.now().isoformat()
-        })
+        entity_id, command_type = _error_fields(command)
+        timestamp = self._now_iso()
+        fields = (entity_id, command_type, error_code, error_message)
+
+        if all(type(f) is str and not _JSON_UNSAFE_RE.search(f) for f in fields):
+            # Common case: plain strings can be substituted without escaping
+            payload = (_ERROR_TEMPLATE % (*fields, timestamp)).encode()
+        else:
+            payload = _dumpb({
+                'entity_id': entity_id,
+                'command_type': command_type,
+                'error_code': error_code,
+                'error_message': error_message,
+                'timestamp': timestamp
+            })
 
-        self.mqtt_client.publish(error_topic, payload, retain=False)
+        self.mqtt_client.publish(ERROR_TOPIC, payload, qos=self.ack_qos, retain=False)
 
     def _is_multi_speed_fan(self, entity_id: str) -> bool:
         """Check if fan entity supports multiple speeds (has fan_id configured)"""
         if not self.ha_discovery:
             return False
-        for entity in self.ha_discovery.entities:
-            if entity.get('entity_id') == entity_id:
-                return entity.get('supports_speed', False)
-        return False
+        entity = self._get_entity(entity_id)
+        if entity is None:
+            return False
+        return entity.get('supports_speed', False)
 
     def _publish_fan_percentage(self, entity_id: str, speed_value: str):
         """
@@ -560,34 +883,76 @@ class CommandHandler:
     # Utility Methods
     # =========================================================================
 
-    def _format_frame(self, can_id: int, data: List[int]) -> str:
+    def _now_iso(self) -> str:
+        """
+        Get current local time as an ISO 8601 string (millisecond precision)
+
+        The date/time prefix is formatted once per second; only the
+        milliseconds are appended per call.
+        """
+        sec, ms = divmod(_time_ns() // 1_000_000, 1000)
+        cached_sec, prefix = self._ts_cache
+        if sec != cached_sec:
+            prefix = _fromtimestamp(sec).isoformat()
+            self._ts_cache = (sec, prefix)
+        return f'{prefix}.{ms:03d}'
+
+    def _format_frame(self, can_id: int, data: bytes) -> str:
         """Format CAN frame as hex string for logging"""
-        data_hex = ''.join(f'{b:02X}' for b in data)
-        return f"{can_id:08X}#{data_hex}"
+        return f"{can_id:08X}#{bytes(data).hex().upper()}"
+
+    def _audit_flush_loop(self):
+        """Background loop writing buffered audit entries"""
+        interval_s = self.audit_flush_interval_ms / 1000
+        flush = self.audit_logger.flush
+        while not self._audit_flush_stop.wait(interval_s):
+            # Don't wait for the ack queue here: under steady traffic it
+            # never fully drains and the timer would stop flushing
+            flush()
+
+    def flush_audit(self):
+        """Write queued acknowledgments and any buffered audit entries"""
+        if self._ack_queue is not None:
+            self._ack_queue.join()
+        self.audit_logger.flush()
+
+    def close(self):
+        """
+        Stop background flushing and finish queued work (call on shutdown)
+
+        Waits for sequences queued on the transmitter's batch thread
+        (async_tx) and for queued acknowledgments (async_ack), then writes
+        buffered audit entries.
+        """
+        self._audit_flush_stop.set()
+        if self._send_batch is not None:
+            self.transmitter.close()
+        self.flush_audit()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get handler statistics"""
-        stats = self.stats.copy()
-
-        if stats['total_commands'] > 0:
-            stats['success_rate'] = round(
-                (stats['successful_commands'] / stats['total_commands']) * 100,
-                2
-            )
-        else:
-            stats['success_rate'] = 0
-
-        return stats
+        total = self._total_commands
+        successful = self._successful_commands
+        success_rate = round((successful / total) * 100, 2) if total > 0 else 0
+
+        return {
+            'total_commands': total,
+            'successful_commands': successful,
+            'validation_failures': self._validation_failures,
+            'transmission_failures': self._transmission_failures,
+            'encoding_failures': self._encoding_failures,
+            'ack_queue_overflows': self._ack_overflows,
+            'success_rate': success_rate,
+        }
 
     def reset_stats(self):
         """Reset statistics"""
-        self.stats = {
-            'total_commands': 0,
-            'successful_commands': 0,
-            'validation_failures': 0,
-            'transmission_failures': 0,
-            'encoding_failures': 0,
-        }
+        self._total_commands = 0
+        self._successful_commands = 0
+        self._validation_failures = 0
+        self._transmission_failures = 0
+        self._encoding_failures = 0
+        self._ack_overflows = 0
 
 
 # =============================================================================
@@ -10,18 +10,77 @@ Phase 2: Bidirectional Communication
 
 import time
 from collections import deque
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Callable, Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 
+# Rate limit clock: monotonic, so wall-clock adjustments can't open or
+# extend limit windows
+_monotonic = time.monotonic
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ValidationError:
-    """Validation error details"""
+    """Validation error details (immutable; static errors are shared)"""
     code: str
     message: str
     field: Optional[str] = None
 
 
+@dataclass(slots=True)
+class _CompiledRule:
+    """Value rules for one (command_type, action), flattened from VALIDATION_RULES"""
+    value_field: str
+    expected_type: Any = None                     # Type or tuple, for isinstance()
+    type_name: str = ''                           # expected_type, for messages
+    reject_bool: bool = False                     # Numeric rule: bool isn't a number
+    allowed_values: Optional[Tuple] = None        # Original values, for messages
+    allowed_lower: Optional[frozenset] = None     # Strings lowercased, for membership
+    min_value: Any = None
+    max_value: Any = None
+    # Specialized check for the common valid case (see _make_fast_check)
+    accepts: Callable[[Any], bool] = lambda value: False
+
+
+def _make_fast_check(rule: _CompiledRule) -> Callable[[Any], bool]:
+    """
+    Build a value check specialized to one rule's constraints
+
+    The check only has to be right when it returns True; False sends the
+    value through the full checks in _validate_value_range, which produce
+    the specific error (or accept values the fast check doesn't cover,
+    such as str or int subclasses).
+
+    Args:
+        rule: Compiled rule
+
+    Returns:
+        Function of the value returning True if it is definitely valid
+    """
+    expected = rule.expected_type
+    if isinstance(expected, type):
+        expected = (expected,)
+    allowed_lower = rule.allowed_lower
+    lo, hi = rule.min_value, rule.max_value
+
+    if expected == (str,) and allowed_lower is not None and lo is None and hi is None:
+        # String enum: ON/OFF, climate modes, cover positions
+        def accepts(value, _allowed=allowed_lower):
+            return type(value) is str and value.lower() in _allowed
+        return accepts
+
+    if (expected and allowed_lower is None and lo is not None and hi is not None
+            and all(t in (int, float) for t in expected)):
+        # Bounded number: brightness, temperature
+        types = frozenset(expected)
+
+        def accepts(value, _types=types, _lo=lo, _hi=hi):
+            return type(value) in _types and _lo <= value <= _hi
+        return accepts
+
+    # Anything else always takes the full checks
+    return rule.accepts
+
+
 class CommandValidator:
     """
     Multi-layer command validator
@@ -34,6 +93,11 @@ class CommandValidator:
     5. Rate limiting (prevent flooding)
     """
 
+    # Bits for validate(skip=...) - layers a trusted caller may bypass.
+    # Schema, entity, and value range checks always run.
+    SKIP_SECURITY = 0x1
+    SKIP_RATE_LIMIT = 0x2
+
     # Validation rules for each command type
     VALIDATION_RULES = {
         'light': {
@@ -119,32 +183,114 @@ class CommandValidator:
         self.ha_discovery = ha_discovery
         self.config = config or {}
 
-        # Security settings
+        # Security settings (immutable; construct a new validator to change them)
         self.security_enabled = self.config.get('security_enabled', True)
-        self.allowlist = set(self.config.get('allowlist', []))
-        self.denylist = set(self.config.get('denylist', []))
-        self.allowed_command_types = set(self.config.get('allowed_commands', ['light', 'climate', 'switch', 'fan', 'cover']))
+        self.allowlist = frozenset(self.config.get('allowlist', []))
+        self.denylist = frozenset(self.config.get('denylist', []))
+        self.allowed_command_types = frozenset(self.config.get('allowed_commands', ['light', 'climate', 'switch', 'fan', 'cover']))
+        self._has_allowlist = len(self.allowlist) > 0
 
         # Rate limiting settings
         self.rate_limit_enabled = self.config.get('rate_limit_enabled', True)
         self.global_limit = self.config.get('global_commands_per_second', 10)
         self.entity_limit = self.config.get('entity_commands_per_second', 2)
         self.entity_cooldown_ms = self.config.get('entity_cooldown_ms', 500)
-
-        # Rate limiting state
-        self.global_timestamps = deque(maxlen=100)
+        self._entity_cooldown_s = self.entity_cooldown_ms / 1000.0
+
+        # Errors with fixed messages, built once per validator
+        self._err_not_dict = ValidationError(
+            code='E001',
+            message='Command must be a dictionary'
+        )
+        self._err_missing_type = ValidationError(
+            code='E002',
+            message='Missing required field: command_type',
+            field='command_type'
+        )
+        self._err_type_not_allowed = {
+            command_type: ValidationError(
+                code='E017',
+                message=f'Command type {command_type} is not allowed',
+                field='command_type'
+            )
+            for command_type in self.VALIDATION_RULES
+        }
+        self._err_global_rate = ValidationError(
+            code='E018',
+            message=f'Global rate limit exceeded ({self.global_limit} commands/sec)',
+            field=None
+        )
+        self._err_entity_rate = ValidationError(
+            code='E019',
+            message=f'Entity rate limit exceeded ({self.entity_limit} commands/sec)',
+            field='entity_id'
+        )
+
+        # VALIDATION_RULES flattened for lookup by (command_type, action)
+        self._required, self._compiled = self._compile_rules(self.VALIDATION_RULES)
+
+        # Rate limiting state (timestamps within the last second; evicted by
+        # age, so each deque holds at most its rate limit)
+        self.global_timestamps = deque()
         self.entity_timestamps: Dict[str, deque] = {}
 
+        # Idle entity deques are purged every entity_gc_interval rate-limit
+        # checks so entity_timestamps doesn't grow without bound
+        self._gc_interval = self.config.get('entity_gc_interval', 1024)
+        self._gc_counter = 0
+
+    @staticmethod
+    def _compile_rules(validation_rules: Dict[str, Dict]) -> Tuple[Dict[str, Tuple[str, ...]],
+                                                                  Dict[Tuple[str, str], _CompiledRule]]:
+        """
+        Flatten validation rules into per-type and per-action lookup tables
+
+        Args:
+            validation_rules: Rules in VALIDATION_RULES format
+
+        Returns:
+            ({command_type: required_fields}, {(command_type, action): rule})
+        """
+        required = {}
+        compiled = {}
+        for command_type, rules in validation_rules.items():
+            required[command_type] = tuple(rules['required_fields'])
+            for action, action_rules in rules['actions'].items():
+                allowed = action_rules.get('allowed_values')
+                expected_type = action_rules.get('value_type')
+                types = (expected_type if isinstance(expected_type, tuple)
+                         else (expected_type,) if expected_type else ())
+                compiled[(command_type, action)] = _CompiledRule(
+                    value_field=action_rules.get('value_field', 'value'),
+                    expected_type=expected_type,
+                    type_name=' or '.join(t.__name__ for t in types),
+                    reject_bool=(bool not in types
+                                 and any(t in (int, float) for t in types)),
+                    allowed_values=tuple(allowed) if allowed is not None else None,
+                    allowed_lower=frozenset(
+                        v.lower() if isinstance(v, str) else v for v in allowed
+                    ) if allowed is not None else None,
+                    min_value=action_rules.get('min_value'),
+                    max_value=action_rules.get('max_value'),
+                )
+                rule = compiled[(command_type, action)]
+                rule.accepts = _make_fast_check(rule)
+        return required, compiled
+
     # =========================================================================
     # Main Validation Entry Point
     # =========================================================================
 
-    def validate(self, command: Dict[str, Any]) -> Tuple[bool, Optional[ValidationError]]:
+    def validate(self, command: Dict[str, Any], skip: int = 0,
+                 now: Optional[float] = None) -> Tuple[bool, Optional[ValidationError]]:
         """
         Validate command through all layers
 
         Args:
             command: Command dictionary to validate
+            skip: Bitmask of SKIP_* layers to bypass (trusted callers only)
+            now: time.monotonic() reading to use for rate limiting; callers
+                validating a batch can pass one reading for all commands
 
         Returns:
             (is_valid, error) - error is None if valid
@@ -157,30 +303,39 @@ class CommandValidator:
                 'value': any (the command value)
             }
         """
+        # Fields shared by the layers, read once (schema rejects non-dicts)
+        if isinstance(command, dict):
+            entity_id = command.get('entity_id')
+            command_type = command.get('command_type')
+        else:
+            entity_id = command_type = None
+
         # Layer 1: Schema validation
-        valid, error = self._validate_schema(command)
+        valid, error = self._validate_schema(command, command_type)
         if not valid:
             return False, error
 
         # Layer 2: Entity validation
-        valid, error = self._validate_entity(command)
+        valid, error = self._validate_entity(entity_id, command_type)
         if not valid:
             return False, error
 
         # Layer 3: Value range validation
-        valid, error = self._validate_value_range(command)
+        valid, error = self._validate_value_range(command, command_type)
         if not valid:
             return False, error
 
         # Layer 4: Security check
-        valid, error = self._validate_security(command)
-        if not valid:
-            return False, error
+        if self.security_enabled and not skip & self.SKIP_SECURITY:
+            valid, error = self._validate_security(entity_id, command_type)
+            if not valid:
+                return False, error
 
-        # Layer 5: Rate limiting
-        valid, error = self._check_rate_limit(command)
-        if not valid:
-            return False, error
+        # Layer 5: Rate limiting (skipped callers don't touch rate limit state)
+        if self.rate_limit_enabled and not skip & self.SKIP_RATE_LIMIT:
+            valid, error = self._check_rate_limit(entity_id, now)
+            if not valid:
+                return False, error
 
         return True, None
 
@@ -188,7 +343,8 @@ class CommandValidator:
     # Layer 1: Schema Validation
     # =========================================================================
 
-    def _validate_schema(self, command: Dict[str, Any]) -> Tuple[bool, Optional[ValidationError]]:
+    def _validate_schema(self, command: Dict[str, Any],
+                         command_type: Optional[str]) -> Tuple[bool, Optional[ValidationError]]:
         """
         Validate command structure and required fields
 
@@ -200,32 +356,22 @@ class CommandValidator:
         """
         # Check command is dict
         if not isinstance(command, dict):
-            return False, ValidationError(
-                code='E001',
-                message='Command must be a dictionary'
-            )
+            return False, self._err_not_dict
 
         # Check command_type exists and is valid
-        command_type = command.get('command_type')
         if not command_type:
-            return False, ValidationError(
-                code='E002',
-                message='Missing required field: command_type',
-                field='command_type'
-            )
+            return False, self._err_missing_type
 
-        if command_type not in self.VALIDATION_RULES:
+        required_fields = self._required.get(command_type)
+        if required_fields is None:
             return False, ValidationError(
                 code='E003',
                 message=f'Invalid command_type: {command_type}',
                 field='command_type'
             )
 
-        # Get validation rules for this command type
-        rules = self.VALIDATION_RULES[command_type]
-
         # Check required fields
-        for field in rules['required_fields']:
+        for field in required_fields:
             if field not in command:
                 return False, ValidationError(
                     code='E004',
@@ -234,9 +380,9 @@ class CommandValidator:
                 )
 
         # Check action is valid (for command types that have actions)
-        if 'action' in rules['required_fields']:
+        if 'action' in required_fields:
             action = command.get('action')
-            if action not in rules['actions']:
+            if (command_type, action) not in self._compiled:
                 return False, ValidationError(
                     code='E005',
                     message=f'Invalid action: {action}',
@@ -249,7 +395,8 @@ class CommandValidator:
     # Layer 2: Entity Validation
     # =========================================================================
 
-    def _validate_entity(self, command: Dict[str, Any]) -> Tuple[bool, Optional[ValidationError]]:
+    def _validate_entity(self, entity_id: Optional[str],
+                         command_type: str) -> Tuple[bool, Optional[ValidationError]]:
         """
         Validate entity exists and is controllable
 
@@ -257,8 +404,6 @@ class CommandValidator:
         - Entity exists in HA discovery mapping
         - Entity is of correct type for command
         """
-        entity_id = command.get('entity_id')
-
         if not entity_id:
             return False, ValidationError(
                 code='E006',
@@ -281,7 +426,6 @@ class CommandValidator:
             )
 
         # Verify entity type matches command type
-        command_type = command.get('command_type')
         entity_type = entity.get('entity_type')
 
         if entity_type != command_type:
@@ -298,6 +442,11 @@ class CommandValidator:
         if not self.ha_discovery or not hasattr(self.ha_discovery, 'entities'):
             return None
 
+        # HADiscovery keeps an entity_id index of the loaded mapping
+        get_entity = getattr(self.ha_discovery, 'get_entity', None)
+        if get_entity is not None:
+            return get_entity(entity_id)
+
         for entity in self.ha_discovery.entities:
             if entity.get('entity_id') == entity_id:
                 return entity
@@ -308,7 +457,8 @@ class CommandValidator:
     # Layer 3: Value Range Validation
     # =========================================================================
 
-    def _validate_value_range(self, command: Dict[str, Any]) -> Tuple[bool, Optional[ValidationError]]:
+    def _validate_value_range(self, command: Dict[str, Any],
+                              command_type: str) -> Tuple[bool, Optional[ValidationError]]:
         """
         Validate command value is within acceptable range
 
@@ -317,31 +467,30 @@ class CommandValidator:
         - Value is within min/max bounds (for numeric values)
         - Value is in allowed values list (for enum values)
         """
-        command_type = command.get('command_type')
-        rules = self.VALIDATION_RULES[command_type]
-
         # Determine which action rules to use
         if 'action' in command:
             # Climate commands have explicit actions
             action = command.get('action')
-            if action not in rules['actions']:
-                return False, ValidationError(
-                    code='E009',
-                    message=f'Invalid action: {action}',
-                    field='action'
-                )
-            action_rules = rules['actions'][action]
         else:
             # Light/switch commands infer action from presence of fields
-            if 'brightness' in command or command.get('action') == 'brightness':
-                action_rules = rules['actions']['brightness']
-            else:
-                action_rules = rules['actions']['state']
+            action = 'brightness' if 'brightness' in command else 'state'
+
+        rule = self._compiled.get((command_type, action))
+        if rule is None:
+            return False, ValidationError(
+                code='E009',
+                message=f'Invalid action: {action}',
+                field='action'
+            )
 
         # Get value to validate
-        value_field = action_rules.get('value_field', 'value')
+        value_field = rule.value_field
         value = command.get(value_field)
 
+        # Fast path: specialized check for the rule accepts the value
+        if rule.accepts(value):
+            return True, None
+
         if value is None:
             return False, ValidationError(
                 code='E010',
@@ -350,39 +499,35 @@ class CommandValidator:
             )
 
         # Check value type
-        expected_type = action_rules.get('value_type')
+        expected_type = rule.expected_type
         if expected_type:
-            if not isinstance(value, expected_type):
+            if (not isinstance(value, expected_type)
+                    or (rule.reject_bool and type(value) is bool)):
                 return False, ValidationError(
                     code='E011',
-                    message=f'Invalid value type: expected {expected_type.__name__}, got {type(value).__name__}',
+                    message=f'Invalid value type: expected {rule.type_name}, got {type(value).__name__}',
                     field=value_field
                 )
 
         # Check allowed values (for enums)
-        if 'allowed_values' in action_rules:
-            allowed = action_rules['allowed_values']
-            # Case-insensitive comparison for strings
-            if isinstance(value, str):
-                value_lower = value.lower()
-                allowed_lower = [v.lower() if isinstance(v, str) else v for v in allowed]
-                if value_lower not in allowed_lower:
-                    return False, ValidationError(
-                        code='E012',
-                        message=f'Invalid value: {value}. Allowed: {allowed}',
-                        field=value_field
-                    )
-            else:
-                if value not in allowed:
-                    return False, ValidationError(
-                        code='E012',
-                        message=f'Invalid value: {value}. Allowed: {allowed}',
-                        field=value_field
-                    )
+        allowed_lower = rule.allowed_lower
+        if allowed_lower is not None:
+            # Case-insensitive comparison for strings; one hash lookup either way
+            key = value.lower() if isinstance(value, str) else value
+            try:
+                allowed = key in allowed_lower
+            except TypeError:  # Unhashable value can't be an enum member
+                allowed = False
+            if not allowed:
+                return False, ValidationError(
+                    code='E012',
+                    message=f'Invalid value: {value}. Allowed: {list(rule.allowed_values)}',
+                    field=value_field
+                )
 
         # Check numeric range
-        if 'min_value' in action_rules:
-            min_val = action_rules['min_value']
+        min_val = rule.min_value
+        if min_val is not None:
             if value < min_val:
                 return False, ValidationError(
                     code='E013',
@@ -390,8 +535,8 @@ class CommandValidator:
                     field=value_field
                 )
 
-        if 'max_value' in action_rules:
-            max_val = action_rules['max_value']
+        max_val = rule.max_value
+        if max_val is not None:
             if value > max_val:
                 return False, ValidationError(
                     code='E014',
@@ -405,7 +550,8 @@ class CommandValidator:
     # Layer 4: Security Validation
     # =========================================================================
 
-    def _validate_security(self, command: Dict[str, Any]) -> Tuple[bool, Optional[ValidationError]]:
+    def _validate_security(self, entity_id: str,
+                           command_type: str) -> Tuple[bool, Optional[ValidationError]]:
         """
         Validate command is authorized
 
@@ -417,9 +563,6 @@ class CommandValidator:
         if not self.security_enabled:
             return True, None
 
-        entity_id = command.get('entity_id')
-        command_type = command.get('command_type')
-
         # Check denylist
         if entity_id in self.denylist:
             return False, ValidationError(
@@ -429,7 +572,7 @@ class CommandValidator:
             )
 
         # Check allowlist (if configured)
-        if self.allowlist and entity_id not in self.allowlist:
+        if self._has_allowlist and entity_id not in self.allowlist:
             return False, ValidationError(
                 code='E016',
                 message=f'Entity {entity_id} is not in allowlist',
@@ -438,11 +581,8 @@ class CommandValidator:
 
         # Check command type allowed
         if command_type not in self.allowed_command_types:
-            return False, ValidationError(
-                code='E017',
-                message=f'Command type {command_type} is not allowed',
-                field='command_type'
-            )
+            # Schema validation already limited command_type to known types
+            return False, self._err_type_not_allowed[command_type]
 
         return True, None
 
@@ -450,62 +590,84 @@ class CommandValidator:
     # Layer 5: Rate Limiting
     # =========================================================================
 
-    def _check_rate_limit(self, command: Dict[str, Any]) -> Tuple[bool, Optional[ValidationError]]:
+    def _check_rate_limit(self, entity_id: str,
+                          now: Optional[float] = None) -> Tuple[bool, Optional[ValidationError]]:
         """
         Check if command exceeds rate limits
 
-        Checks:
-        - Global rate limit (commands per second across all entities)
+        Checks (per-entity first, so rejected entities never touch the
+        global window):
         - Per-entity rate limit (commands per second for this entity)
         - Per-entity cooldown (minimum time between commands)
+        - Global rate limit (commands per second across all entities)
         """
         if not self.rate_limit_enabled:
             return True, None
 
-        now = time.time()
-        entity_id = command.get('entity_id')
+        if now is None:
+            now = _monotonic()
+        cutoff = now - 1.0
 
-        # Check global rate
-        recent_global = [t for t in self.global_timestamps if now - t < 1.0]
-        if len(recent_global) >= self.global_limit:
-            return False, ValidationError(
-                code='E018',
-                message=f'Global rate limit exceeded ({self.global_limit} commands/sec)',
-                field=None
-            )
-
-        # Initialize entity timestamp queue if needed
-        if entity_id not in self.entity_timestamps:
-            self.entity_timestamps[entity_id] = deque(maxlen=10)
+        # Entity state is only created once a command is accepted
+        entity_timestamps = self.entity_timestamps.get(entity_id)
+        if entity_timestamps is not None:
+            # Check entity rate
+            self._evict(entity_timestamps, cutoff)
+            if len(entity_timestamps) >= self.entity_limit:
+                return False, self._err_entity_rate
 
-        # Check entity rate
-        recent_entity = [t for t in self.entity_timestamps[entity_id] if now - t < 1.0]
-        if len(recent_entity) >= self.entity_limit:
-            return False, ValidationError(
-                code='E019',
-                message=f'Entity rate limit exceeded ({self.entity_limit} commands/sec)',
-                field='entity_id'
-            )
+            # Check entity cooldown
+            if entity_timestamps:
+                delta = now - entity_timestamps[-1]
 
-        # Check entity cooldown
-        if self.entity_timestamps[entity_id]:
-            last_command = self.entity_timestamps[entity_id][-1]
-            time_since_last_ms = (now - last_command) * 1000
+                if delta < self._entity_cooldown_s:
+                    remaining_ms = (self._entity_cooldown_s - delta) * 1000.0
+                    return False, ValidationError(
+                        code='E020',
+                        message=f'Entity cooldown active ({remaining_ms:.0f}ms remaining)',
+                        field='entity_id'
+                    )
+        elif self.entity_limit <= 0:
+            return False, self._err_entity_rate
 
-            if time_since_last_ms < self.entity_cooldown_ms:
-                remaining_ms = self.entity_cooldown_ms - time_since_last_ms
-                return False, ValidationError(
-                    code='E020',
-                    message=f'Entity cooldown active ({remaining_ms:.0f}ms remaining)',
-                    field='entity_id'
-                )
+        # Check global rate
+        global_timestamps = self.global_timestamps
+        self._evict(global_timestamps, cutoff)
+        if len(global_timestamps) >= self.global_limit:
+            return False, self._err_global_rate
 
         # Record timestamps
-        self.global_timestamps.append(now)
-        self.entity_timestamps[entity_id].append(now)
+        global_timestamps.append(now)
+        if entity_timestamps is None:
+            entity_timestamps = self.entity_timestamps[entity_id] = deque()
+        entity_timestamps.append(now)
+
+        self._gc_counter += 1
+        if self._gc_counter >= self._gc_interval:
+            self._gc_counter = 0
+            self._purge_idle_entities(now)
 
         return True, None
 
+    def _purge_idle_entities(self, now: float):
+        """
+        Drop entity deques that can no longer affect a rate-limit decision
+
+        An entity is idle once its newest timestamp is older than both the
+        one-second rate window and the cooldown period.
+        """
+        cutoff = now - max(1.0, self._entity_cooldown_s)
+        stale = [entity_id for entity_id, timestamps in self.entity_timestamps.items()
+                 if not timestamps or timestamps[-1] <= cutoff]
+        for entity_id in stale:
+            del self.entity_timestamps[entity_id]
+
+    @staticmethod
+    def _evict(timestamps: deque, cutoff: float):
+        """Drop timestamps older than cutoff from the front of a deque"""
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+
     # =========================================================================
     # Utility Methods
     # =========================================================================
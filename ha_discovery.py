@@ -8,10 +8,53 @@ for Home Assistant integration.
 Documentation: https://www.home-assistant.io/integrations/mqtt/#mqtt-discovery
 """
 
+import functools
 import json
 import yaml
 import os
 
+# Fast JSON serialization (optional - falls back to stdlib json)
+try:
+    import orjson
+    _dumpb = orjson.dumps
+except ImportError:
+    orjson = None
+
+    # Reused encoder producing compact UTF-8 output, like orjson
+    _ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False,
+                                check_circular=False)
+
+    def _dumpb(obj):
+        """Serialize to compact JSON bytes using the stdlib encoder"""
+        return _ENCODER.encode(obj).encode()
+
+# Use the libyaml C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+@functools.lru_cache(maxsize=64)
+def _key_aliases(keys):
+    """
+    Underscore aliases for decoded message keys containing spaces
+
+    Lets templates write value['dc_voltage'] for the 'dc voltage' field.
+    Cached because each RV-C message type always decodes to the same keys.
+
+    Args:
+        keys: Tuple of decoded message keys
+
+    Returns:
+        tuple: (alias, original key) pairs
+    """
+    return tuple(
+        (key.replace(' ', '_'), key) for key in keys
+        if isinstance(key, str) and ' ' in key and key.replace(' ', '_') not in keys
+    )
+
+
 class HADiscovery:
     """Manages Home Assistant MQTT Discovery configuration and publishing"""
 
@@ -29,6 +72,20 @@ class HADiscovery:
         self.entities = []
         self.devices = {}
         self.settings = {}
+        self._cached_messages = None  # Built on first generate_discovery_messages()
+        self._entities_by_rvc = {}  # rvc_message -> [entity, ...]
+        self._entities_by_id = {}  # entity_id -> entity
+
+        # Discovery payload generator for each supported entity type
+        self._generators = {
+            'sensor': self._generate_sensor_discovery,
+            'binary_sensor': self._generate_binary_sensor_discovery,
+            'light': self._generate_light_discovery,
+            'switch': self._generate_switch_discovery,
+            'climate': self._generate_climate_discovery,
+            'fan': self._generate_fan_discovery,
+            'cover': self._generate_cover_discovery,
+        }
 
         self.load_mapping()
 
@@ -37,8 +94,17 @@ class HADiscovery:
         if not os.path.exists(self.mapping_file):
             raise FileNotFoundError(f"Mapping file not found: {self.mapping_file}")
 
-        with open(self.mapping_file, 'r') as f:
-            self.mapping = yaml.safe_load(f)
+        # Taken before reading, so a file changed mid-read is re-parsed
+        # next time rather than cached under its new signature
+        source = self._mapping_signature()
+        self.mapping = self._load_cached_mapping(source)
+        if self.mapping is None:
+            with open(self.mapping_file, 'r') as f:
+                self.mapping = yaml.load(f, Loader=_YamlLoader)
+            self._write_cached_mapping(source)
+
+        # Discovery payloads are derived from the mapping
+        self._cached_messages = None
 
         # Extract settings
         self.settings = self.mapping.get('settings', {})
@@ -52,6 +118,114 @@ class HADiscovery:
 
         # Store entities for lookup
         self.entities = self.mapping.get('entities', [])
+        self._attach_topics()
+
+        # Index entities by RV-C message for per-frame lookups and by ID for
+        # command handling, and resolve their device info
+        self._entities_by_rvc = {}
+        self._entities_by_id = {}
+        for entity in self.entities:
+            self._entities_by_rvc.setdefault(entity['rvc_message'], []).append(entity)
+            # First entry wins, matching a linear scan
+            self._entities_by_id.setdefault(entity.get('entity_id'), entity)
+            entity['_device_info'] = self.devices.get(entity.get('device'))
+
+        # Compile value templates once; invalid ones are reported by
+        # extract_value when evaluated
+        for entity in self.entities:
+            if 'value_template' in entity:
+                try:
+                    entity['_vt_code'] = compile(
+                        entity['value_template'], f"<vt:{entity['entity_id']}>", 'eval')
+                except SyntaxError:
+                    pass
+
+    def _attach_topics(self):
+        """
+        Precompute the MQTT topics of every entity
+
+        The state publisher looks topics up for each decoded CAN frame, so
+        they are formatted once here instead of per message. Stored under
+        underscore keys after the JSON cache has been written.
+        """
+        prefix = self.state_topic_prefix
+        for entity in self.entities:
+            entity_type = entity['entity_type']
+            base_topic = f"{prefix}/{entity_type}/{entity['entity_id']}"
+            entity['_state_topic'] = f"{base_topic}/state"
+            if entity_type == 'cover':
+                entity['_command_topic'] = f"{base_topic}/position/set"
+            elif entity_type in ('light', 'switch', 'fan'):
+                entity['_command_topic'] = f"{base_topic}/set"
+            if entity_type == 'light' and entity.get('supports_brightness'):
+                entity['_brightness_topic'] = f"{base_topic}/brightness"
+                entity['_brightness_command_topic'] = f"{base_topic}/brightness/set"
+            elif entity_type == 'climate':
+                entity['_climate_topics'] = {
+                    'mode': f"{base_topic}/mode",
+                    'setpoint': f"{base_topic}/setpoint",
+                    'temperature': f"{base_topic}/temperature",
+                    'fan': f"{base_topic}/fan"
+                }
+
+    def _cache_file(self):
+        """Path of the JSON copy of the parsed mapping file"""
+        return self.mapping_file + '.cache.json'
+
+    def _mapping_signature(self):
+        """
+        Identify the current mapping file contents
+
+        Returns:
+            list: [size, mtime_ns] of the mapping file
+        """
+        st = os.stat(self.mapping_file)
+        return [st.st_size, st.st_mtime_ns]
+
+    def _load_cached_mapping(self, source):
+        """
+        Load the parsed mapping from its JSON cache if it is up to date
+
+        The cache is only used if it was written for exactly this size and
+        mtime, so replacing the YAML with an older copy (cp -p, rsync -t,
+        restore from backup) is still noticed.
+
+        Args:
+            source: Current _mapping_signature()
+
+        Returns:
+            dict: Cached mapping, or None if missing, stale, or unreadable
+        """
+        try:
+            with open(self._cache_file(), 'rb') as f:
+                cached = json.loads(f.read())
+            if cached.get('source') != source:
+                return None
+            return cached['mapping']
+        except (OSError, ValueError, AttributeError, KeyError):
+            return None
+
+    def _write_cached_mapping(self, source):
+        """
+        Save the parsed mapping as JSON for faster startup
+
+        Skipped when the mapping doesn't survive a JSON round trip (e.g.
+        non-string keys or dates) or the directory isn't writable.
+
+        Args:
+            source: _mapping_signature() taken before the YAML was read
+        """
+        try:
+            if json.loads(json.dumps(self.mapping)) != self.mapping:
+                return
+            data = json.dumps({'source': source, 'mapping': self.mapping})
+            cache_file = self._cache_file()
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                f.write(data)
+            os.replace(tmp_file, cache_file)
+        except (OSError, TypeError, ValueError):
+            pass
 
     def _build_device_info(self, device_config):
         """
@@ -83,17 +257,24 @@ class HADiscovery:
         """
         Generate all discovery messages for configured entities
 
+        Messages depend only on the mapping, so they are built once and
+        reused until load_mapping() runs again.
+
         Returns:
-            list: List of (topic, payload) tuples ready to publish
+            list: List of (topic, payload) tuples ready to publish, with
+                  payloads as JSON bytes
         """
-        messages = []
+        if self._cached_messages is None:
+            messages = []
 
-        for entity in self.entities:
-            topic, payload = self._generate_entity_discovery(entity)
-            if topic and payload:
-                messages.append((topic, payload))
+            for entity in self.entities:
+                topic, payload = self._generate_entity_discovery(entity)
+                if topic and payload:
+                    messages.append((topic, payload))
+
+            self._cached_messages = messages
 
-        return messages
+        return list(self._cached_messages)
 
     def _generate_entity_discovery(self, entity):
         """
@@ -103,7 +284,7 @@ class HADiscovery:
             entity: Entity configuration from mapping file
 
         Returns:
-            tuple: (topic, payload) or (None, None) if error
+            tuple: (topic, payload_bytes) or (None, None) if error
         """
         entity_type = entity['entity_type']
         entity_id = entity['entity_id']
@@ -115,32 +296,20 @@ class HADiscovery:
         topic = f"{self.discovery_prefix}/{entity_type}/{unique_id}/config"
 
         # Generate payload based on entity type
-        if entity_type == 'sensor':
-            payload = self._generate_sensor_discovery(entity, unique_id)
-        elif entity_type == 'binary_sensor':
-            payload = self._generate_binary_sensor_discovery(entity, unique_id)
-        elif entity_type == 'light':
-            payload = self._generate_light_discovery(entity, unique_id)
-        elif entity_type == 'switch':
-            payload = self._generate_switch_discovery(entity, unique_id)
-        elif entity_type == 'climate':
-            payload = self._generate_climate_discovery(entity, unique_id)
-        elif entity_type == 'fan':
-            payload = self._generate_fan_discovery(entity, unique_id)
-        elif entity_type == 'cover':
-            payload = self._generate_cover_discovery(entity, unique_id)
-        else:
+        generator = self._generators.get(entity_type)
+        if generator is None:
             print(f"Warning: Unknown entity type '{entity_type}' for {entity_id}")
             return None, None
+        payload = generator(entity, unique_id)
 
-        # Convert payload to JSON
-        payload_json = json.dumps(payload)
+        # Convert payload to JSON (bytes, published as-is)
+        payload_json = _dumpb(payload)
 
         return topic, payload_json
 
     def _generate_sensor_discovery(self, entity, unique_id):
         """Generate discovery payload for sensor entity"""
-        state_topic = f"{self.state_topic_prefix}/sensor/{entity['entity_id']}/state"
+        state_topic = entity['_state_topic']
 
         payload = {
             "name": entity['name'],
@@ -172,14 +341,15 @@ class HADiscovery:
             payload['suggested_display_precision'] = 1
 
         # Add device info
-        if entity.get('device') and entity['device'] in self.devices:
-            payload['device'] = self.devices[entity['device']]
+        device_info = entity.get('_device_info')
+        if device_info is not None:
+            payload['device'] = device_info
 
         return payload
 
     def _generate_binary_sensor_discovery(self, entity, unique_id):
         """Generate discovery payload for binary_sensor entity"""
-        state_topic = f"{self.state_topic_prefix}/binary_sensor/{entity['entity_id']}/state"
+        state_topic = entity['_state_topic']
 
         payload = {
             "name": entity['name'],
@@ -200,15 +370,16 @@ class HADiscovery:
             payload['icon'] = entity['icon']
 
         # Add device info
-        if entity.get('device') and entity['device'] in self.devices:
-            payload['device'] = self.devices[entity['device']]
+        device_info = entity.get('_device_info')
+        if device_info is not None:
+            payload['device'] = device_info
 
         return payload
 
     def _generate_light_discovery(self, entity, unique_id):
         """Generate discovery payload for light entity"""
-        state_topic = f"{self.state_topic_prefix}/light/{entity['entity_id']}/state"
-        command_topic = f"{self.state_topic_prefix}/light/{entity['entity_id']}/set"
+        state_topic = entity['_state_topic']
+        command_topic = entity['_command_topic']
 
         payload = {
             "name": entity['name'],
@@ -224,8 +395,8 @@ class HADiscovery:
 
         # Add brightness support if specified
         if entity.get('supports_brightness', False):
-            brightness_topic = f"{self.state_topic_prefix}/light/{entity['entity_id']}/brightness"
-            brightness_command_topic = f"{self.state_topic_prefix}/light/{entity['entity_id']}/brightness/set"
+            brightness_topic = entity['_brightness_topic']
+            brightness_command_topic = entity['_brightness_command_topic']
             payload['brightness_state_topic'] = brightness_topic
             payload['brightness_command_topic'] = brightness_command_topic
             payload['brightness_scale'] = 100
@@ -235,15 +406,16 @@ class HADiscovery:
             payload['icon'] = entity['icon']
 
         # Add device info
-        if entity.get('device') and entity['device'] in self.devices:
-            payload['device'] = self.devices[entity['device']]
+        device_info = entity.get('_device_info')
+        if device_info is not None:
+            payload['device'] = device_info
 
         return payload
 
     def _generate_switch_discovery(self, entity, unique_id):
         """Generate discovery payload for switch entity"""
-        state_topic = f"{self.state_topic_prefix}/switch/{entity['entity_id']}/state"
-        command_topic = f"{self.state_topic_prefix}/switch/{entity['entity_id']}/set"
+        state_topic = entity['_state_topic']
+        command_topic = entity['_command_topic']
 
         payload = {
             "name": entity['name'],
@@ -265,8 +437,9 @@ class HADiscovery:
             payload['device_class'] = entity['device_class']
 
         # Add device info
-        if entity.get('device') and entity['device'] in self.devices:
-            payload['device'] = self.devices[entity['device']]
+        device_info = entity.get('_device_info')
+        if device_info is not None:
+            payload['device'] = device_info
 
         return payload
 
@@ -312,15 +485,16 @@ class HADiscovery:
             payload['precision'] = entity['precision']
 
         # Add device info
-        if entity.get('device') and entity['device'] in self.devices:
-            payload['device'] = self.devices[entity['device']]
+        device_info = entity.get('_device_info')
+        if device_info is not None:
+            payload['device'] = device_info
 
         return payload
 
     def _generate_fan_discovery(self, entity, unique_id):
         """Generate discovery payload for fan entity"""
-        state_topic = f"{self.state_topic_prefix}/fan/{entity['entity_id']}/state"
-        command_topic = f"{self.state_topic_prefix}/fan/{entity['entity_id']}/set"
+        state_topic = entity['_state_topic']
+        command_topic = entity['_command_topic']
 
         payload = {
             "name": entity['name'],
@@ -349,15 +523,16 @@ class HADiscovery:
             payload['icon'] = entity['icon']
 
         # Add device info
-        if entity.get('device') and entity['device'] in self.devices:
-            payload['device'] = self.devices[entity['device']]
+        device_info = entity.get('_device_info')
+        if device_info is not None:
+            payload['device'] = device_info
 
         return payload
 
     def _generate_cover_discovery(self, entity, unique_id):
         """Generate discovery payload for cover entity"""
-        state_topic = f"{self.state_topic_prefix}/cover/{entity['entity_id']}/state"
-        command_topic = f"{self.state_topic_prefix}/cover/{entity['entity_id']}/position/set"
+        state_topic = entity['_state_topic']
+        command_topic = entity['_command_topic']
 
         payload = {
             "name": entity['name'],
@@ -379,8 +554,9 @@ class HADiscovery:
             payload['icon'] = entity['icon']
 
         # Add device info
-        if entity.get('device') and entity['device'] in self.devices:
-            payload['device'] = self.devices[entity['device']]
+        device_info = entity.get('_device_info')
+        if device_info is not None:
+            payload['device'] = device_info
 
         return payload
 
@@ -395,13 +571,23 @@ class HADiscovery:
         Returns:
             list: List of matching entity configurations
         """
-        matches = []
-        for entity in self.entities:
-            if entity['rvc_message'] == rvc_message:
-                # Match if instance is None (no instance) or matches
-                if entity.get('instance') is None or entity.get('instance') == instance:
-                    matches.append(entity)
-        return matches
+        # Match if instance is None (no instance) or matches
+        return [
+            entity for entity in self._entities_by_rvc.get(rvc_message, ())
+            if entity.get('instance') is None or entity.get('instance') == instance
+        ]
+
+    def get_entity(self, entity_id):
+        """
+        Find entity configuration by entity ID
+
+        Args:
+            entity_id: Entity ID (e.g., "ceiling_light")
+
+        Returns:
+            dict: Entity configuration, or None if not in the mapping
+        """
+        return self._entities_by_id.get(entity_id)
 
     def get_state_topic(self, entity):
         """
@@ -413,6 +599,9 @@ class HADiscovery:
         Returns:
             str: State topic path
         """
+        topic = entity.get('_state_topic')
+        if topic is not None:
+            return topic
         entity_type = entity['entity_type']
         entity_id = entity['entity_id']
         return f"{self.state_topic_prefix}/{entity_type}/{entity_id}/state"
@@ -427,6 +616,9 @@ class HADiscovery:
         Returns:
             str: Brightness topic path or None
         """
+        topic = entity.get('_brightness_topic')
+        if topic is not None:
+            return topic
         if entity['entity_type'] == 'light' and entity.get('supports_brightness'):
             entity_id = entity['entity_id']
             return f"{self.state_topic_prefix}/light/{entity_id}/brightness"
@@ -442,6 +634,9 @@ class HADiscovery:
         Returns:
             dict: Dictionary of topic names and paths
         """
+        topics = entity.get('_climate_topics')
+        if topics is not None:
+            return topics
         if entity['entity_type'] != 'climate':
             return {}
 
@@ -469,45 +664,13 @@ class HADiscovery:
         # If there's a value_template, evaluate it
         if 'value_template' in entity:
             try:
-                # Create safe evaluation context
-                # Helper function to get field with both underscore and space variants
-                def get_field(data, field):
-                    """Try to get field with underscores, then with spaces"""
-                    if field in data:
-                        return data[field]
-                    # Try replacing underscores with spaces
-                    field_with_spaces = field.replace('_', ' ')
-                    if field_with_spaces in data:
-                        return data[field_with_spaces]
-                    # Try without changes
-                    return data.get(field)
-
-                # Make decoded_data accessible to template
-                value = decoded_data
-                # Add helper to access fields flexibly
-                import types
-                value_dict = types.SimpleNamespace()
-                for key in decoded_data.keys():
-                    # Make fields accessible with underscores
-                    safe_key = key.replace(' ', '_').replace('(', '').replace(')', '').replace('/', '_')
-                    setattr(value_dict, safe_key, decoded_data[key])
-
-                # Evaluate template with flexible field access
-                # Replace value['field'] with get_field(value, 'field')
-                template = entity['value_template']
-                # Simple approach: make value support both formats
-                class FlexDict(dict):
-                    def __getitem__(self, key):
-                        if key in self:
-                            return dict.__getitem__(self, key)
-                        # Try with spaces
-                        key_with_spaces = key.replace('_', ' ')
-                        if key_with_spaces in self:
-                            return dict.__getitem__(self, key_with_spaces)
-                        raise KeyError(key)
-
-                value = FlexDict(decoded_data)
-                result = eval(template)
+                # Evaluate template with flexible field access; use the
+                # code compiled in load_mapping when there is one
+                template = entity.get('_vt_code') or entity['value_template']
+                value = dict(decoded_data)
+                for alias, key in _key_aliases(tuple(decoded_data)):
+                    value[alias] = decoded_data[key]
+                result = eval(template, {'value': value})
                 return result
             except Exception as e:
                 if str(e) not in ["'relative_level'", "'relative level'"]:  # Don't spam for known issue
@@ -532,20 +695,28 @@ class HADiscovery:
         Args:
             mqttc: MQTT client instance
             debug_level: Debug output level
+
+        Returns:
+            list: MQTTMessageInfo for each message, for callers that want
+                  to wait_for_publish() once the network loop is running
         """
         messages = self.generate_discovery_messages()
 
         if debug_level > 0:
             print(f"Publishing {len(messages)} HA MQTT Discovery messages...")
 
+        publish = mqttc.publish
+        infos = []
         for topic, payload in messages:
-            mqttc.publish(topic, payload, retain=True, qos=1)
+            infos.append(publish(topic, payload, retain=True, qos=1))
             if debug_level > 1:
                 print(f"  Published: {topic}")
 
         if debug_level > 0:
             print(f"HA MQTT Discovery complete. {len(messages)} entities configured.")
 
+        return infos
+
 
 def test_discovery():
     """Test function to validate discovery message generation"""
@@ -34,6 +34,7 @@ ha_mapping_file = config.get('HomeAssistant', 'mapping_file', fallback='mappings
 ha_legacy_topics = bool(config.getint('HomeAssistant', 'legacy_topics', fallback=1))
 
 last_msg_time = None
+time_of_last_cache = (0, '')  # (epoch second, formatted OpenRoad/time_of_last value)
 ha_discovery = None  # Will be initialized if discovery is enabled
 can_transmitter = None  # Phase 2: Will be initialized if commands are enabled
 
@@ -44,6 +45,10 @@ if commands_enabled:
     cmd_source_address = config.getint('Commands', 'source_address', fallback=99)
     cmd_retry_count = config.getint('Commands', 'retry_count', fallback=3)
     cmd_retry_delay_ms = config.getint('Commands', 'retry_delay_ms', fallback=100)
+    cmd_precise_timing = bool(config.getint('Commands', 'precise_timing', fallback=0))
+    cmd_async_tx = bool(config.getint('Commands', 'async_tx', fallback=0))
+    cmd_async_ack = bool(config.getint('Commands', 'async_ack', fallback=0))
+    cmd_ack_qos = config.getint('Commands', 'ack_qos', fallback=0)
 
     # Rate limiting settings
     rate_limit_enabled = bool(config.getint('RateLimiting', 'enabled', fallback=1))
@@ -74,6 +79,8 @@ if commands_enabled:
     audit_json_format = bool(config.getint('Audit', 'json_format', fallback=1))
     audit_max_bytes = config.getint('Audit', 'max_bytes', fallback=10485760)
     audit_backup_count = config.getint('Audit', 'backup_count', fallback=5)
+    audit_batch_size = config.getint('Audit', 'batch_size', fallback=1)
+    audit_flush_interval_ms = config.getint('Audit', 'flush_interval_ms', fallback=50)
 
     # Map log level string to constant
     audit_log_levels = {
@@ -236,14 +243,18 @@ class TCP_CANWatcher(threading.Thread):
 
 def mqtt_safe_publish(client, topic, payload, retain):
     global last_msg_time
+    global time_of_last_cache
     # Publish the main MQTT message
     client.publish(topic, payload, retain=retain)
 
-    # Get the current timestamp
-    current_time = time.time()
+    # Get the current timestamp (whole seconds - that's all that's displayed)
+    current_time = int(time.time())
 
-    # Convert the current time to a human-readable format
-    human_readable_time = datetime.fromtimestamp(current_time).strftime('%Y-%m-%d %H:%M:%S')
+    # Convert the current time to a human-readable format, once per second
+    cached_time, human_readable_time = time_of_last_cache
+    if current_time != cached_time:
+        human_readable_time = datetime.fromtimestamp(current_time).strftime('%Y-%m-%d %H:%M:%S')
+        time_of_last_cache = (current_time, human_readable_time)
 
     # Publish the time since the last message to an MQTT topic
     client.publish("OpenRoad/time_of_last", human_readable_time, retain=retain)
@@ -704,9 +715,9 @@ def main():
         else:
             if debug_level > 0:
                 print("DGN: {0:s}, Prio: {1:d}, srcAD: {2:s}, Data: {3:s}".format(
-                    dgn, prio, srcAD, ", ".join("{0:02X}".format(x) for x in data)))
+                    dgn, prio, srcAD, bytes(data).hex(' ').upper().replace(' ', ', ')))
 
-            myresult = rvc_decode(dgn, "".join("{0:02X}".format(x) for x in data))
+            myresult = rvc_decode(dgn, bytes(data).hex().upper())
 
             if screenOut > 0:
                 print(json.dumps(myresult))
@@ -728,9 +739,10 @@ def main():
 
                 # Publish to legacy topics (if enabled)
                 if ha_legacy_topics:
-                    for newtopic, payload in process_Tiffin(topic, json.dumps(myresult),previous_values):
+                    result_json = json.dumps(myresult)
+                    for newtopic, payload in process_Tiffin(topic, result_json, previous_values):
                         if newtopic == "UNCHANGED":
-                            mqtt_safe_publish(mqttc, topic, json.dumps(myresult),retain)
+                            mqtt_safe_publish(mqttc, topic, result_json, retain)
                         elif newtopic != "IGNORE":
                             mqtt_safe_publish(mqttc, newtopic, payload, retain)
 
@@ -744,6 +756,11 @@ def main():
         except KeyboardInterrupt:
             print("Interrupted by user, stopping.")
         finally:
+            # Finish queued commands/acks while the MQTT loop can still send
+            if command_handler:
+                command_handler.close()
+            if audit_logger:
+                audit_logger.close()
             mqttc.loop_stop()
     mainLoop()
 
@@ -768,6 +785,12 @@ if __name__ == "__main__":
                 # Set availability will message (published when we disconnect)
                 availability_topic = "{}/status".format(ha_discovery.state_topic_prefix)
                 mqttc.will_set(availability_topic, "offline", retain=True, qos=1)
+
+                # Let the retained discovery burst go out in one pipelined
+                # window instead of stalling every 20 messages on PUBACKs
+                # (paho only allows changing this before connecting)
+                mqttc.max_inflight_messages_set(
+                    max(20, len(ha_discovery.generate_discovery_messages())))
             except Exception as e:
                 print("Error loading HA Discovery mapping: {}".format(e))
                 ha_discovery = None
@@ -784,6 +807,7 @@ if __name__ == "__main__":
                     json_format=audit_json_format,
                     max_bytes=audit_max_bytes,
                     backup_count=audit_backup_count,
+                    batch_size=audit_batch_size,
                     console_output=(debug_level > 1)
                 )
                 print(f"  Audit logging: {audit_log_file}")
@@ -796,6 +820,7 @@ if __name__ == "__main__":
                 can_port=f'socket://{canbus}',
                 retry_count=cmd_retry_count,
                 retry_delay_ms=cmd_retry_delay_ms,
+                precise_timing=cmd_precise_timing,
                 debug_level=debug_level
             )
             print(f"  CAN TX: socket://{canbus}")
@@ -816,10 +841,18 @@ if __name__ == "__main__":
                 encoder=encoder,
                 validator=validator,
                 transmitter=can_transmitter,
-                audit_logger=audit_logger if audit_enabled else AuditLogger(log_file='/dev/null', console_output=False),
+                # When auditing is disabled, a level above CRITICAL makes every
+                # log call return right after counting stats
+                audit_logger=audit_logger if audit_enabled else AuditLogger(
+                    log_file='/dev/null', log_level=AuditLogger.LEVEL_CRITICAL + 1, console_output=False
+                ),
                 ha_discovery=ha_discovery,
                 mqtt_client=mqttc,
-                debug_level=debug_level
+                debug_level=debug_level,
+                audit_flush_interval_ms=audit_flush_interval_ms,
+                async_tx=cmd_async_tx,
+                async_ack=cmd_async_ack,
+                ack_qos=cmd_ack_qos
             )
             print("  Command handler: Ready")
 
@@ -20,11 +20,11 @@ class RVCCommandEncoder:
     Encode HA commands into RV-C CAN frames
 
     Each encoder method returns a list of CAN frames to transmit:
-        [(can_id, data_bytes, delay_ms), ...]
+        [(can_id, bytes(data_bytes), delay_ms), ...]
 
     Where:
         can_id: int - 29-bit CAN arbitration ID
-        data_bytes: list[int] - 8 bytes of data (0-255)
+        data_bytes: bytes - 8 bytes of data, ready for can.Message
         delay_ms: int - Delay before next frame (milliseconds)
     """
 
@@ -131,7 +131,7 @@ class RVCCommandEncoder:
     def encode_light_on_off(self,
                            instance: int,
                            turn_on: bool,
-                           duration: int = 255) -> List[Tuple[int, List[int], int]]:
+                           duration: int = 255) -> List[Tuple[int, bytes, int]]:
         """
         Encode light on/off command
 
@@ -167,7 +167,7 @@ class RVCCommandEncoder:
             0xFF
         ]
 
-        frames = [(can_id, data, 0)]
+        frames = [(can_id, bytes(data), 0)]
 
         # No cleanup sequence needed for ON_DELAY/OFF_DELAY commands
 
@@ -175,7 +175,7 @@ class RVCCommandEncoder:
 
     def encode_light_brightness(self,
                                instance: int,
-                               brightness_pct: int) -> List[Tuple[int, List[int], int]]:
+                               brightness_pct: int) -> List[Tuple[int, bytes, int]]:
         """
         Encode light brightness command
 
@@ -206,7 +206,7 @@ class RVCCommandEncoder:
             0xFF
         ]
 
-        frames = [(can_id, data, 0)]
+        frames = [(can_id, bytes(data), 0)]
 
         # No cleanup sequence - keep it simple
 
@@ -214,7 +214,7 @@ class RVCCommandEncoder:
 
     def _build_dimmer_cleanup_sequence(self,
                                       instance: int,
-                                      can_id: int) -> List[Tuple[int, List[int], int]]:
+                                      can_id: int) -> List[Tuple[int, bytes, int]]:
         """
         Build cleanup sequence for dimmer set level commands
 
@@ -241,7 +241,7 @@ class RVCCommandEncoder:
             0xFF,
             0xFF
         ]
-        frames.append((can_id, data2, 5000))  # 5 second delay
+        frames.append((can_id, bytes(data2), 5000))  # 5 second delay
 
         # Frame 3: Stop ramp
         data3 = [
@@ -254,13 +254,13 @@ class RVCCommandEncoder:
             0xFF,
             0xFF
         ]
-        frames.append((can_id, data3, 0))
+        frames.append((can_id, bytes(data3), 0))
 
         return frames
 
     def encode_panel_light(self,
                           instance: int,
-                          brightness_pct: int) -> List[Tuple[int, List[int], int]]:
+                          brightness_pct: int) -> List[Tuple[int, bytes, int]]:
         """
         Encode panel light brightness command
 
@@ -290,7 +290,7 @@ class RVCCommandEncoder:
             0xFF
         ]
 
-        return [(can_id, data, 0)]
+        return [(can_id, bytes(data), 0)]
 
     # =========================================================================
     # Climate/Thermostat Commands
@@ -299,7 +299,7 @@ class RVCCommandEncoder:
     def encode_climate_mode(self,
                            instance: int,
                            mode: str,
-                           current_mode: Optional[str] = None) -> List[Tuple[int, List[int], int]]:
+                           current_mode: Optional[str] = None) -> List[Tuple[int, bytes, int]]:
         """
         Encode thermostat mode command
 
@@ -323,12 +323,12 @@ class RVCCommandEncoder:
         # Build data frame: [instance] + [7 command bytes]
         data = [instance] + list(cmd_bytes)
 
-        return [(can_id, data, 0)]
+        return [(can_id, bytes(data), 0)]
 
     def encode_climate_temperature(self,
                                   instance: int,
                                   temperature_f: float,
-                                  sync_furnace: bool = True) -> List[Tuple[int, List[int], int]]:
+                                  sync_furnace: bool = True) -> List[Tuple[int, bytes, int]]:
         """
         Encode thermostat temperature setpoint command
 
@@ -364,7 +364,7 @@ class RVCCommandEncoder:
             0xFF
         ]
 
-        frames = [(can_id, data, 0)]
+        frames = [(can_id, bytes(data), 0)]
 
         # If instance is even (0, 2, 4), also set furnace setpoint (instance + 3)
         if sync_furnace and instance % 2 == 0:
@@ -379,14 +379,14 @@ class RVCCommandEncoder:
                 temp_hex[0],
                 0xFF
             ]
-            frames.append((can_id, data_furnace, 0))
+            frames.append((can_id, bytes(data_furnace), 0))
 
         return frames
 
     def encode_climate_fan_mode(self,
                                instance: int,
                                fan_mode: str,
-                               current_mode: Optional[str] = None) -> List[Tuple[int, List[int], int]]:
+                               current_mode: Optional[str] = None) -> List[Tuple[int, bytes, int]]:
         """
         Encode thermostat fan mode command
 
@@ -416,7 +416,7 @@ class RVCCommandEncoder:
 
         data = [instance] + list(cmd_bytes)
 
-        return [(can_id, data, 0)]
+        return [(can_id, bytes(data), 0)]
 
     def _temp_f_to_rvc_hex(self, fahrenheit: float) -> Tuple[int, int]:
         """
@@ -458,7 +458,7 @@ class RVCCommandEncoder:
     def encode_switch_on_off(self,
                             instance: int,
                             turn_on: bool,
-                            source_address: int = 96) -> List[Tuple[int, List[int], int]]:
+                            source_address: int = 96) -> List[Tuple[int, bytes, int]]:
         """
         Encode switch/pump on/off command
 
@@ -487,7 +487,7 @@ class RVCCommandEncoder:
             0xFF
         ]
 
-        return [(can_id, data, 0)]
+        return [(can_id, bytes(data), 0)]
 
     # =========================================================================
     # Vent Fan Commands
@@ -495,7 +495,7 @@ class RVCCommandEncoder:
 
     def encode_vent_fan(self,
                        instance: int,
-                       turn_on: bool) -> List[Tuple[int, List[int], int]]:
+                       turn_on: bool) -> List[Tuple[int, bytes, int]]:
         """
         Encode vent fan on/off command (uses TOGGLE)
 
@@ -523,12 +523,12 @@ class RVCCommandEncoder:
             0xFF
         ]
 
-        return [(can_id, data, 0)]
+        return [(can_id, bytes(data), 0)]
 
     def encode_vent_lid(self,
                        up_instance: int,
                        down_instance: int,
-                       position: str) -> List[Tuple[int, List[int], int]]:
+                       position: str) -> List[Tuple[int, bytes, int]]:
         """
         Encode vent lid position command (dual motor control)
 
@@ -565,7 +565,7 @@ class RVCCommandEncoder:
                 0xFF,
                 0xFF
             ]
-            frames.append((can_id, data_stop, 0))
+            frames.append((can_id, bytes(data_stop), 0))
 
             # Frame 2: Run UP motor for 20 seconds
             data_run = [
@@ -578,7 +578,7 @@ class RVCCommandEncoder:
                 0xFF,
                 0xFF
             ]
-            frames.append((can_id, data_run, 0))
+            frames.append((can_id, bytes(data_run), 0))
 
         else:  # position == 'close'
             # To CLOSE: Stop UP motor, then run DOWN motor for 20 seconds
@@ -593,7 +593,7 @@ class RVCCommandEncoder:
                 0xFF,
                 0xFF
             ]
-            frames.append((can_id, data_stop, 0))
+            frames.append((can_id, bytes(data_stop), 0))
 
             # Frame 2: Run DOWN motor for 20 seconds
             data_run = [
@@ -606,7 +606,7 @@ class RVCCommandEncoder:
                 0xFF,
                 0xFF
             ]
-            frames.append((can_id, data_run, 0))
+            frames.append((can_id, bytes(data_run), 0))
 
         return frames
 
@@ -616,7 +616,7 @@ class RVCCommandEncoder:
 
     def encode_ceiling_fan(self,
                           fan_id: int,
-                          speed: int) -> List[Tuple[int, List[int], int]]:
+                          speed: int) -> List[Tuple[int, bytes, int]]:
         """
         Encode ceiling fan speed command
 
@@ -666,7 +666,7 @@ class RVCCommandEncoder:
                 0xFF,
                 0xFF
             ]
-            frames.append((can_id, data1, 0))
+            frames.append((can_id, bytes(data1), 0))
 
             # Frame 2: Turn on primary load (toggle)
             data2 = [
@@ -679,7 +679,7 @@ class RVCCommandEncoder:
                 0xFF,
                 0xFF
             ]
-            frames.append((can_id, data2, 0))
+            frames.append((can_id, bytes(data2), 0))
         else:
             # Turn off: Turn off both loads
             loads = SPECIAL_LOADS[fan_id][0]
@@ -695,7 +695,7 @@ class RVCCommandEncoder:
                     0xFF,
                     0xFF
                 ]
-                frames.append((can_id, data, 0))
+                frames.append((can_id, bytes(data), 0))
 
         return frames
 
@@ -707,18 +707,18 @@ class RVCCommandEncoder:
         """Validate instance ID is in valid range"""
         return 0 <= instance <= max_instance
 
-    def format_frame_debug(self, can_id: int, data: List[int]) -> str:
+    def format_frame_debug(self, can_id: int, data: bytes) -> str:
         """
         Format CAN frame for debugging output
 
         Args:
             can_id: CAN arbitration ID
-            data: Data bytes
+            data: Data bytes (bytes, bytearray or list of ints)
 
         Returns:
             String in format "19FEDB63#01FFC8000000FFFF"
         """
-        data_hex = ''.join(f'{b:02X}' for b in data)
+        data_hex = bytes(data).hex().upper()
         return f"{can_id:08X}#{data_hex}"
 
 
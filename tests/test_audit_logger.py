@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Audit Logger
+
+Tests the direct JSON-lines writer: rotation and I/O error handling.
+"""
+
+import unittest
+import sys
+import os
+import json
+import logging
+import shutil
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audit_logger import AuditLogger, _JsonAppendWriter
+
+
+class TestJsonAppendWriter(unittest.TestCase):
+    """Test the append-only JSON log writer"""
+
+    def setUp(self):
+        """Create a scratch log directory"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'audit.log')
+
+    def tearDown(self):
+        """Remove the scratch log directory"""
+        shutil.rmtree(self.tmpdir)
+
+    def read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_rollover_shifts_backups(self):
+        """Test rotation follows RotatingFileHandler naming"""
+        writer = _JsonAppendWriter(self.path, max_bytes=10, backup_count=2)
+        for line in (b'aaaaaaa\n', b'bbbbbbb\n', b'ccccccc\n', b'ddddddd\n'):
+            writer.write(line)
+        writer.close()
+
+        self.assertEqual(self.read(self.path), b'ddddddd\n')
+        self.assertEqual(self.read(self.path + '.1'), b'ccccccc\n')
+        self.assertEqual(self.read(self.path + '.2'), b'bbbbbbb\n')
+        self.assertFalse(os.path.exists(self.path + '.3'))
+        self.assertEqual(writer.errors, 0)
+
+    def test_batched_entries_written_on_flush(self):
+        """Test batched entries reach the file only once flushed"""
+        writer = _JsonAppendWriter(self.path, max_bytes=0, backup_count=0, batch_size=10)
+        writer.write(b'one\n')
+        writer.write(b'two\n')
+        self.assertEqual(self.read(self.path), b'')
+
+        writer.flush()
+        self.assertEqual(self.read(self.path), b'one\ntwo\n')
+        writer.close()
+
+    def test_failed_rollover_reopens_log(self):
+        """Test a failed rotation never leaves a stale file descriptor"""
+        writer = _JsonAppendWriter(self.path, max_bytes=10, backup_count=2)
+        writer.write(b'aaaaaaa\n')
+
+        # Log removed behind our back: the rename inside rollover fails
+        os.remove(self.path)
+        writer.write(b'bbbbbbb\n')
+        self.assertEqual(writer.errors, 1)
+
+        # An unrelated file may now reuse the old descriptor number
+        other = os.path.join(self.tmpdir, 'other.txt')
+        with open(other, 'wb') as f:
+            writer.write(b'ccccccc\n')
+            f.flush()
+        writer.close()
+
+        self.assertEqual(self.read(other), b'')
+        self.assertEqual(self.read(self.path), b'ccccccc\n')
+
+    def test_write_error_is_counted_not_raised(self):
+        """Test I/O errors drop the entry instead of raising"""
+        writer = _JsonAppendWriter(self.path, max_bytes=0, backup_count=0)
+        os.close(writer._fd)
+        writer._fd = os.open(self.path, os.O_RDONLY)
+
+        writer.write(b'lost\n')
+        self.assertEqual(writer.errors, 1)
+        writer.close()
+
+    def test_audit_logger_survives_write_errors(self):
+        """Test a broken audit file doesn't fail command logging"""
+        audit = AuditLogger(log_file=self.path, log_level=logging.DEBUG,
+                            json_format=True, batch_size=1)
+        os.close(audit._writer._fd)
+        audit._writer._fd = os.open(self.path, os.O_RDONLY)
+
+        cmd_id = audit.log_command_attempt({'entity_id': 'light_1', 'command_type': 'light',
+                                            'action': 'state', 'value': 'ON'})
+        self.assertEqual(cmd_id, 1)
+        self.assertEqual(audit.get_stats()['write_errors'], 1)
+        audit.close()
+
+    def test_audit_logger_writes_json_lines(self):
+        """Test entries are written as one JSON object per line"""
+        audit = AuditLogger(log_file=self.path, log_level=logging.DEBUG,
+                            json_format=True, batch_size=1)
+        audit.log_command_attempt({'entity_id': 'light_1', 'command_type': 'light',
+                                   'action': 'state', 'value': 'ON'})
+        audit.close()
+
+        lines = self.read(self.path).splitlines()
+        self.assertEqual(len(lines), 1)
+        entry = json.loads(lines[0])
+        self.assertEqual(entry['event'], 'command_attempt')
+        self.assertEqual(entry['entity_id'], 'light_1')
+
+
+    def test_audit_logger_wide_integer_value(self):
+        """Test values orjson can't encode are still logged"""
+        audit = AuditLogger(log_file=self.path, log_level=logging.DEBUG,
+                            json_format=True, batch_size=1)
+        audit.log_command_attempt({'entity_id': 'l1', 'command_type': 'light',
+                                   'action': 'brightness', 'value': 99999999999999999999999})
+        audit.close()
+
+        entry = json.loads(self.read(self.path))
+        self.assertEqual(entry['value'], 99999999999999999999999)
+
+if __name__ == '__main__':
+    unittest.main()
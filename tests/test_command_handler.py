@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Command Handler
+
+Tests background transmission (async_tx), background acknowledgments
+(async_ack) and the JSON acknowledgment payloads.
+"""
+
+import unittest
+import sys
+import os
+import json
+import queue
+import tempfile
+from concurrent.futures import Future
+
+import can
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from command_handler import CommandHandler, STATUS_TOPIC, ERROR_TOPIC
+from rvc_commands import RVCCommandEncoder
+from command_validator import CommandValidator
+from audit_logger import AuditLogger
+from can_tx import CANTransmitter
+
+
+class MockCANTransmitter:
+    """Mock CAN transmitter for testing"""
+
+    def __init__(self):
+        self.frames_sent = []
+
+    def send_frames(self, frames):
+        """Mock send_frames method"""
+        self.frames_sent.extend(frames)
+        return True, None
+
+
+class MockBatchTransmitter(MockCANTransmitter):
+    """Mock transmitter with a batch thread; tests complete the futures"""
+
+    def __init__(self):
+        super().__init__()
+        self.futures = []
+
+    def send_frames_batch(self, frames):
+        """Mock send_frames_batch method"""
+        future = Future()
+        self.futures.append(future)
+        return future
+
+    def close(self):
+        """Mock close method"""
+
+
+class MockInstantTransmitter(MockCANTransmitter):
+    """Mock batch transmitter that finishes before send_frames_batch returns"""
+
+    def send_frames_batch(self, frames):
+        """Mock send_frames_batch method"""
+        future = Future()
+        future.set_result(self.send_frames(frames))
+        return future
+
+    def close(self):
+        """Mock close method"""
+
+
+class MockMQTTClient:
+    """Mock MQTT client recording published messages"""
+
+    def __init__(self):
+        self.published = []
+
+    def publish(self, topic, payload, qos=0, retain=False):
+        """Record a publish"""
+        self.published.append((topic, json.loads(payload)))
+
+    def messages(self, topic):
+        """Payloads published to a topic"""
+        return [payload for t, payload in self.published if t == topic]
+
+
+class MockHADiscovery:
+    """Mock HA Discovery for testing"""
+
+    def __init__(self):
+        self.entities = [
+            {'entity_id': 'ceiling_light', 'instance': 1, 'entity_type': 'light'},
+        ]
+
+
+class HandlerTestCase(unittest.TestCase):
+    """Base class building handlers that log to a scratch directory"""
+
+    def setUp(self):
+        """Create the scratch log directory"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.handlers = []
+
+    def tearDown(self):
+        """Shut down every handler built by the test"""
+        for handler in self.handlers:
+            handler.close()
+            handler.audit_logger.close()
+        self.tmpdir.cleanup()
+
+    def make_handler(self, transmitter, **kwargs):
+        """Build a handler with validation checks relaxed"""
+        handler = CommandHandler(
+            encoder=RVCCommandEncoder(),
+            validator=CommandValidator(config={
+                'security_enabled': False,
+                'rate_limit_enabled': False,
+            }),
+            transmitter=transmitter,
+            audit_logger=AuditLogger(
+                log_file=os.path.join(self.tmpdir.name, 'audit.log'),
+                console_output=False
+            ),
+            ha_discovery=MockHADiscovery(),
+            mqtt_client=MockMQTTClient(),
+            debug_level=0,
+            **kwargs
+        )
+        self.handlers.append(handler)
+        return handler
+
+
+class TestTopicGuard(HandlerTestCase):
+    """Test the rv/.../set command topic check"""
+
+    def setUp(self):
+        """Set up handler"""
+        super().setUp()
+        self.transmitter = MockCANTransmitter()
+        self.handler = self.make_handler(self.transmitter)
+
+    def test_wrong_prefix_rejected(self):
+        """Test topics outside rv/ are rejected without transmitting"""
+        self.assertFalse(self.handler.process_mqtt_command('home/light/ceiling_light/set', 'ON'))
+        self.assertEqual(self.transmitter.frames_sent, [])
+
+    def test_missing_set_suffix_rejected(self):
+        """Test topics not ending in /set are rejected without transmitting"""
+        self.assertFalse(self.handler.process_mqtt_command('rv/light/ceiling_light/state', 'ON'))
+        self.assertFalse(self.handler.process_mqtt_command('rv/light/ceiling_light', 'ON'))
+        self.assertEqual(self.transmitter.frames_sent, [])
+
+    def test_valid_topic_accepted(self):
+        """Test a well-formed command topic is transmitted"""
+        self.assertTrue(self.handler.process_mqtt_command('rv/light/ceiling_light/set', 'ON'))
+        self.assertEqual(len(self.transmitter.frames_sent), 1)
+
+
+class TestBatchTransmit(HandlerTestCase):
+    """Test async_tx through the transmitter's batch thread"""
+
+    def setUp(self):
+        """Set up handler with a batch transmitter"""
+        super().setUp()
+        self.transmitter = MockBatchTransmitter()
+        self.handler = self.make_handler(self.transmitter, async_tx=True)
+        self.mqtt = self.handler.mqtt_client
+
+    def submit(self):
+        """Submit a light command and return its pending future"""
+        self.assertTrue(self.handler.process_mqtt_command('rv/light/ceiling_light/set', 'ON'))
+        self.assertEqual(len(self.transmitter.futures), 1)
+        self.assertEqual(self.mqtt.messages(STATUS_TOPIC)[0]['status'], 'accepted')
+        return self.transmitter.futures[0]
+
+    def test_batch_success(self):
+        """Test a completed batch publishes the success ack"""
+        self.submit().set_result((True, None))
+
+        statuses = [m['status'] for m in self.mqtt.messages(STATUS_TOPIC)]
+        self.assertEqual(statuses, ['accepted', 'success'])
+        self.assertEqual(self.handler.get_stats()['successful_commands'], 1)
+
+    def test_batch_failure(self):
+        """Test a failed batch publishes a transmission error"""
+        self.submit().set_result((False, 'Bus off'))
+
+        errors = self.mqtt.messages(ERROR_TOPIC)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['error_code'], 'E101')
+        self.assertEqual(errors[0]['error_message'], 'Bus off')
+        self.assertEqual(self.handler.get_stats()['transmission_failures'], 1)
+
+    def test_batch_exception(self):
+        """Test an exception from the batch thread publishes E999"""
+        self.submit().set_exception(RuntimeError('boom'))
+
+        errors = self.mqtt.messages(ERROR_TOPIC)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['error_code'], 'E999')
+        self.assertEqual(errors[0]['entity_id'], 'ceiling_light')
+
+    def test_accepted_published_before_result(self):
+        """Test 'accepted' precedes the ack even if transmission finishes first"""
+        handler = self.make_handler(MockInstantTransmitter(), async_tx=True)
+
+        self.assertTrue(handler.process_mqtt_command('rv/light/ceiling_light/set', 'ON'))
+
+        statuses = [m['status'] for m in handler.mqtt_client.messages(STATUS_TOPIC)]
+        self.assertEqual(statuses, ['accepted', 'success'])
+
+    def test_batch_queue_full(self):
+        """Test a full batch queue rejects the command with E102"""
+        def send_frames_batch(frames):
+            raise queue.Full
+        self.handler._send_batch = send_frames_batch
+
+        self.assertFalse(self.handler.process_mqtt_command('rv/light/ceiling_light/set', 'ON'))
+        self.assertEqual(self.mqtt.messages(ERROR_TOPIC)[0]['error_code'], 'E102')
+
+
+class TestTransmitterBatchThread(HandlerTestCase):
+    """Test async_tx with the real transmitter batch thread"""
+
+    def test_queued_command_sent_before_close_returns(self):
+        """Test close() waits for queued transmissions and acks"""
+        bus = can.Bus(interface='virtual', channel='test_command_handler')
+        monitor = can.Bus(interface='virtual', channel='test_command_handler')
+        try:
+            handler = self.make_handler(CANTransmitter(bus=bus), async_tx=True, async_ack=True)
+
+            self.assertTrue(handler.process_mqtt_command('rv/light/ceiling_light/set', 'ON'))
+            handler.close()
+
+            self.assertIsNotNone(monitor.recv(timeout=1))
+            statuses = [m['status'] for m in handler.mqtt_client.messages(STATUS_TOPIC)]
+            self.assertEqual(statuses, ['accepted', 'success'])
+        finally:
+            bus.shutdown()
+            monitor.shutdown()
+
+
+class TestAsyncAck(HandlerTestCase):
+    """Test async_ack background acknowledgments"""
+
+    def setUp(self):
+        """Set up handler with async acknowledgments"""
+        super().setUp()
+        self.handler = self.make_handler(MockCANTransmitter(), async_ack=True)
+        self.mqtt = self.handler.mqtt_client
+
+    def test_ack_published_by_worker(self):
+        """Test success acks are published by the ack worker"""
+        self.assertTrue(self.handler.process_mqtt_command('rv/light/ceiling_light/set', 'ON'))
+        self.handler.flush_audit()
+
+        self.assertEqual(self.mqtt.messages(STATUS_TOPIC)[0]['status'], 'success')
+        self.assertEqual(self.handler.get_stats()['ack_queue_overflows'], 0)
+
+    def test_ack_queue_overflow_falls_back_inline(self):
+        """Test a full ack queue acknowledges inline instead of dropping"""
+        full_queue = queue.Queue(maxsize=1)
+        full_queue.put_nowait(None)
+        self.handler._ack_queue = full_queue
+
+        self.assertTrue(self.handler.process_mqtt_command('rv/light/ceiling_light/set', 'ON'))
+
+        self.assertEqual(self.mqtt.messages(STATUS_TOPIC)[0]['status'], 'success')
+        self.assertEqual(self.handler.get_stats()['ack_queue_overflows'], 1)
+
+        # Let close() join the stand-in queue
+        full_queue.get_nowait()
+        full_queue.task_done()
+
+
+class TestAckPayloads(HandlerTestCase):
+    """Test acknowledgment JSON payloads"""
+
+    def setUp(self):
+        """Set up handler"""
+        super().setUp()
+        self.handler = self.make_handler(MockCANTransmitter())
+        self.mqtt = self.handler.mqtt_client
+
+    def test_success_payload(self):
+        """Test the success template produces the expected JSON"""
+        command = {'entity_id': 'ceiling_light', 'command_type': 'light',
+                   'action': 'brightness', 'value': 75}
+        self.handler._publish_success(command, 12.5)
+
+        ack = self.mqtt.messages(STATUS_TOPIC)[0]
+        self.assertEqual(ack['entity_id'], 'ceiling_light')
+        self.assertEqual(ack['value'], 75)
+        self.assertEqual(ack['status'], 'success')
+        self.assertEqual(ack['latency_ms'], 12.5)
+
+    def test_success_payload_escaped(self):
+        """Test fields needing JSON escaping still produce valid JSON"""
+        command = {'entity_id': 'porch "front"', 'command_type': 'light',
+                   'action': 'state', 'value': 'O\\N\n'}
+        self.handler._publish_success(command, 1.0)
+
+        ack = self.mqtt.messages(STATUS_TOPIC)[0]
+        self.assertEqual(ack['entity_id'], 'porch "front"')
+        self.assertEqual(ack['value'], 'O\\N\n')
+
+    def test_error_payload_escaped(self):
+        """Test error messages needing JSON escaping produce valid JSON"""
+        command = {'entity_id': 'ceiling_light', 'command_type': 'light'}
+        self.handler._publish_error(command, 'E101', 'Failed: "bus"\\\n')
+
+        error = self.mqtt.messages(ERROR_TOPIC)[0]
+        self.assertEqual(error['error_code'], 'E101')
+        self.assertEqual(error['error_message'], 'Failed: "bus"\\\n')
+
+    def test_error_payload_non_string_fields(self):
+        """Test non-string fields fall back to the JSON encoder"""
+        command = {'entity_id': None, 'command_type': 'light'}
+        self.handler._publish_error(command, 'E001', 'Missing entity_id')
+
+        error = self.mqtt.messages(ERROR_TOPIC)[0]
+        self.assertIsNone(error['entity_id'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,7 @@ import unittest
 import sys
 import os
 import time
+from unittest.mock import patch
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -349,6 +350,33 @@ class TestValueRangeValidation(unittest.TestCase):
         self.assertFalse(valid)
         self.assertEqual(error.code, 'E015')
 
+    def test_numeric_value_rejects_bool(self):
+        """Test booleans are not accepted as numeric values"""
+        command = {
+            'entity_id': 'test',
+            'command_type': 'light',
+            'action': 'brightness',
+            'value': True
+        }
+
+        valid, error = self.validator.validate(command)
+        self.assertFalse(valid)
+        self.assertEqual(error.code, 'E011')
+
+    def test_climate_temperature_wrong_type(self):
+        """Test temperature with wrong type names both accepted types"""
+        command = {
+            'entity_id': 'test',
+            'command_type': 'climate',
+            'action': 'temperature',
+            'value': 'warm'
+        }
+
+        valid, error = self.validator.validate(command)
+        self.assertFalse(valid)
+        self.assertEqual(error.code, 'E011')
+        self.assertIn('int or float', error.message)
+
 
 class TestSecurityControls(unittest.TestCase):
     """Test security controls (Layer 4)"""
@@ -610,6 +638,118 @@ class TestRateLimiting(unittest.TestCase):
             valid, error = validator.validate(command)
             self.assertTrue(valid)
 
+    def test_skip_rate_limit(self):
+        """Test SKIP_RATE_LIMIT bypasses rate limiting without recording timestamps"""
+        validator = CommandValidator(config={
+            'security_enabled': False,
+            'rate_limit_enabled': True,
+            'global_commands_per_second': 1,
+            'entity_commands_per_second': 1,
+            'entity_cooldown_ms': 1000,
+        })
+
+        command = {
+            'entity_id': 'test',
+            'command_type': 'light',
+            'action': 'state',
+            'value': 'ON'
+        }
+
+        for _ in range(5):
+            valid, error = validator.validate(command, skip=CommandValidator.SKIP_RATE_LIMIT)
+            self.assertTrue(valid)
+
+        # Skipped commands don't count against the limit
+        valid, error = validator.validate(command)
+        self.assertTrue(valid)
+
+    def test_global_rate_limit_above_100(self):
+        """Test global limits above 100 commands/sec are enforced"""
+        validator = CommandValidator(config={
+            'security_enabled': False,
+            'rate_limit_enabled': True,
+            'global_commands_per_second': 150,
+        })
+
+        for i in range(150):
+            valid, error = validator.validate({
+                'entity_id': f'light{i}',
+                'command_type': 'light',
+                'action': 'state',
+                'value': 'ON'
+            })
+            self.assertTrue(valid)
+
+        valid, error = validator.validate({
+            'entity_id': 'light150',
+            'command_type': 'light',
+            'action': 'state',
+            'value': 'ON'
+        })
+        self.assertFalse(valid)
+        self.assertEqual(error.code, 'E018')
+
+    def test_idle_entities_purged(self):
+        """Test idle per-entity rate limit state is periodically dropped"""
+        validator = CommandValidator(config={
+            'security_enabled': False,
+            'rate_limit_enabled': True,
+            'entity_gc_interval': 3,
+        })
+
+        def command(entity_id):
+            return {
+                'entity_id': entity_id,
+                'command_type': 'light',
+                'action': 'state',
+                'value': 'ON'
+            }
+
+        validator.validate(command('light1'), now=100.0)
+        validator.validate(command('light2'), now=100.1)
+        self.assertEqual(len(validator.entity_timestamps), 2)
+
+        # Third check triggers a purge; light1/light2 are past the window
+        valid, _ = validator.validate(command('light3'), now=102.0)
+        self.assertTrue(valid)
+        self.assertEqual(list(validator.entity_timestamps), ['light3'])
+
+    def test_rate_limit_after_idle_purge(self):
+        """Test a purged entity is rate limited again from scratch"""
+        validator = CommandValidator(config={
+            'security_enabled': False,
+            'rate_limit_enabled': True,
+            'global_commands_per_second': 100,
+            'entity_commands_per_second': 2,
+            'entity_cooldown_ms': 0,
+            'entity_gc_interval': 3,
+        })
+        command = {
+            'entity_id': 'light1',
+            'command_type': 'light',
+            'action': 'state',
+            'value': 'ON'
+        }
+        clock = [100.0]
+
+        with patch('command_validator._monotonic', lambda: clock[0]):
+            self.assertTrue(validator.validate(command)[0])
+            self.assertIn('light1', validator.entity_timestamps)
+
+            # Past the idle window: the next checks trigger a purge
+            clock[0] = 105.0
+            validator.validate(dict(command, entity_id='light2'))
+            validator.validate(dict(command, entity_id='light3'))
+            self.assertNotIn('light1', validator.entity_timestamps)
+
+            # light1 starts a fresh window and is still limited to 2/s
+            clock[0] = 105.1
+            self.assertTrue(validator.validate(command)[0])
+            self.assertTrue(validator.validate(command)[0])
+            valid, error = validator.validate(command)
+            self.assertFalse(valid)
+            self.assertEqual(error.code, 'E019')
+
 
 class TestValidationStatistics(unittest.TestCase):
     """Test validation statistics tracking"""
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for HA Discovery
+
+Tests the JSON sidecar cache of the parsed mapping file.
+"""
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ha_discovery
+from ha_discovery import HADiscovery
+
+MAPPING_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'mappings', 'tiffin_default.yaml')
+
+
+class TestMappingCache(unittest.TestCase):
+    """Test the parsed-mapping JSON cache"""
+
+    def setUp(self):
+        """Copy the default mapping into a scratch directory"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.mapping_file = os.path.join(self.tmpdir, 'mapping.yaml')
+        shutil.copy(MAPPING_FILE, self.mapping_file)
+        self.cache_file = self.mapping_file + '.cache.json'
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.tmpdir)
+
+    def test_cache_written_on_first_load(self):
+        """Test the first load writes the parsed mapping as JSON"""
+        discovery = HADiscovery(self.mapping_file)
+
+        with open(self.cache_file) as f:
+            cached = json.load(f)['mapping']
+        self.assertEqual(len(cached['entities']), len(discovery.entities))
+
+        # Derived per-entity keys are not persisted
+        for entity in cached['entities']:
+            self.assertFalse([key for key in entity if key.startswith('_')])
+
+    def test_cache_used_when_fresh(self):
+        """Test a fresh cache is loaded without parsing the YAML"""
+        expected = HADiscovery(self.mapping_file).generate_discovery_messages()
+
+        with patch.object(ha_discovery.yaml, 'load', side_effect=AssertionError('parsed YAML')):
+            discovery = HADiscovery(self.mapping_file)
+
+        self.assertEqual(discovery.generate_discovery_messages(), expected)
+
+    def test_stale_cache_ignored(self):
+        """Test the YAML is re-parsed when it is newer than the cache"""
+        HADiscovery(self.mapping_file)
+        with open(self.cache_file, 'w') as f:
+            json.dump({'entities': []}, f)
+        mtime = os.path.getmtime(self.cache_file)
+        os.utime(self.mapping_file, (mtime + 10, mtime + 10))
+
+        discovery = HADiscovery(self.mapping_file)
+
+        self.assertTrue(discovery.entities)
+
+    def test_older_replacement_detected(self):
+        """Test a YAML replaced by a copy with an older mtime is re-parsed"""
+        HADiscovery(self.mapping_file)
+        cache_mtime = os.path.getmtime(self.cache_file)
+
+        with open(self.mapping_file, 'a') as f:
+            f.write('\n# edited\n')
+        os.utime(self.mapping_file, (cache_mtime - 3600, cache_mtime - 3600))
+
+        with patch.object(ha_discovery.yaml, 'load', wraps=ha_discovery.yaml.load) as load:
+            HADiscovery(self.mapping_file)
+        self.assertEqual(load.call_count, 1)
+
+    def test_corrupt_cache_ignored(self):
+        """Test an unreadable cache falls back to the YAML"""
+        HADiscovery(self.mapping_file)
+        with open(self.cache_file, 'w') as f:
+            f.write('{not json')
+
+        discovery = HADiscovery(self.mapping_file)
+
+        self.assertTrue(discovery.entities)
+
+
+
+class TestEntityLookup(unittest.TestCase):
+    """Test entity lookups on the loaded mapping"""
+
+    def setUp(self):
+        """Load the default mapping"""
+        self.discovery = HADiscovery(MAPPING_FILE)
+
+    def test_get_entity(self):
+        """Test entities are found by entity_id"""
+        entity = self.discovery.entities[0]
+        self.assertIs(self.discovery.get_entity(entity['entity_id']), entity)
+        self.assertIsNone(self.discovery.get_entity('no_such_entity'))
+
+    def test_get_entity_by_rvc_message(self):
+        """Test entities are found by RV-C message and instance"""
+        entity = self.discovery.entities[0]
+        matches = self.discovery.get_entity_by_rvc_message(
+            entity['rvc_message'], entity.get('instance'))
+        self.assertIn(entity, matches)
+
+if __name__ == '__main__':
+    unittest.main()
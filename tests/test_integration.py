@@ -135,6 +135,11 @@ class TestMQTTMessageParsing(unittest.TestCase):
         command = self.handler._parse_mqtt_message('invalid/topic/format', 'ON')
         self.assertIsNone(command)
 
+    def test_parse_state_topic_rejected(self):
+        """Test the published state topic is not accepted as a command path"""
+        command = self.handler._parse_mqtt_message('rv/light/ceiling_light/state/set', 'ON')
+        self.assertIsNone(command)
+
     def test_parse_invalid_payload(self):
         """Test parsing invalid payload"""
         # Non-numeric brightness
@@ -180,6 +185,24 @@ class TestCommandEncoding(unittest.TestCase):
         self.assertEqual(data[0], 1)      # Instance 1
         self.assertEqual(data[2], 0xC8)   # Brightness 100%
 
+    def test_encode_after_mapping_reload(self):
+        """Test entities added by a mapping reload can be encoded"""
+        self.handler.ha_discovery.entities = self.handler.ha_discovery.entities + [
+            {'entity_id': 'porch_light', 'instance': 7, 'entity_type': 'light'},
+        ]
+        command = {
+            'entity_id': 'porch_light',
+            'command_type': 'light',
+            'action': 'state',
+            'value': 'ON'
+        }
+
+        frames = self.handler._encode_command(command)
+
+        self.assertIsNotNone(frames)
+        can_id, data, delay = frames[0]
+        self.assertEqual(data[0], 7)      # Instance 7
+
     def test_encode_light_brightness(self):
         """Test encoding light brightness command"""
         command = {
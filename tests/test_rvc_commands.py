@@ -327,7 +327,7 @@ class TestRVCCommandEncoder(unittest.TestCase):
                 self.assertLess(can_id, 0x20000000)
 
                 # Data should be 8 bytes
-                self.assertIsInstance(data, list)
+                self.assertIsInstance(data, bytes)
                 self.assertEqual(len(data), 8)
 
                 # All bytes should be 0-255
@@ -430,6 +430,13 @@ class TestRVCCommandEdgeCases(unittest.TestCase):
             frames = self.encoder.encode_climate_mode(instance=1, mode=mode)
             self.assertEqual(len(frames), 1)
 
+    def test_format_frame_debug(self):
+        """Test frame formatting accepts bytes and lists of ints"""
+        data = [0x01, 0xFF, 0xC8, 0x00, 0x00, 0x00, 0xFF, 0xFF]
+        expected = "19FEDB63#01FFC8000000FFFF"
+        self.assertEqual(self.encoder.format_frame_debug(0x19FEDB63, bytes(data)), expected)
+        self.assertEqual(self.encoder.format_frame_debug(0x19FEDB63, data), expected)
+
 
 def run_tests():
     """Run all tests"""